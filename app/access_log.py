@@ -0,0 +1,219 @@
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from collections import deque
+from enum import StrEnum
+from typing import TextIO
+
+from app.http.request import Request
+from app.http.response import FileRange, Response
+
+logger = logging.getLogger(__name__)
+
+
+class AccessLogFormat(StrEnum):
+    COMBINED = "combined"
+    JSON = "json"
+
+
+# (time, client, method, target, version, status, size, referer, user agent,
+# duration): the raw fields, formatted later on the writer thread.
+_Entry = tuple[float, str, str, str, str, int, int, str, str, float]
+
+
+class AccessLog:
+    """Writes one line per request from a background thread, in batches.
+
+    log() only samples the request and appends a tuple of its fields to a deque,
+    which needs no lock, so request threads never wait on formatting, the stream
+    or each other. A writer thread wakes every flush_interval seconds, or as soon
+    as batch_size entries are pending, formats the pending entries in the Apache
+    combined format or as JSON lines and writes each batch with a single call.
+
+    When more than max_pending entries are waiting, because the stream cannot keep
+    up, new entries are dropped and counted in dropped instead of slowing requests
+    down or growing memory without bound.
+
+    Attributes:
+        log_format (AccessLogFormat): Line format.
+        sample_rate (float): Fraction of requests logged, from 0 to 1.
+        max_pending (int): Entries buffered before new ones are dropped.
+        batch_size (int): Maximum entries formatted and written per write.
+        flush_interval (float): Longest time, in seconds, an entry waits to be
+            written.
+
+    The stream is a text stream or a file path to append to, standard output by
+    default.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO | str | None = None,
+        log_format: AccessLogFormat = AccessLogFormat.COMBINED,
+        sample_rate: float = 1.0,
+        max_pending: int = 10_000,
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+    ) -> None:
+        self.log_format: AccessLogFormat = log_format
+        self.sample_rate: float = sample_rate
+        self.max_pending: int = max_pending
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.dropped: int = 0
+        self.written: int = 0
+        self._path: str | None = stream if isinstance(stream, str) else None
+        self._stream: TextIO | None = None if isinstance(stream, str) else stream
+        self._entries: deque[_Entry] = deque()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.running: bool = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._entries)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        if self._path is not None:
+            self._stream = open(self._path, "a", encoding="utf-8")
+        self.running = True
+        self._thread = threading.Thread(
+            target=self._run, name="http-access-log", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer after writing every pending entry."""
+        if not self.running:
+            return
+        self.running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._path is not None and self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def log(
+        self,
+        address: tuple | str,
+        request: Request,
+        status: int,
+        size: int,
+        duration: float,
+    ) -> None:
+        """
+        Queue an entry for a served request, unless it is sampled out or dropped.
+
+        Args:
+            address (tuple | str): Client address as returned by accept().
+            request (Request): The request.
+            status (int): The response status code.
+            size (int): Response body bytes sent, 0 when unknown.
+            duration (float): Seconds spent serving the request.
+        """
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        entries = self._entries
+        if len(entries) >= self.max_pending or not self.running:
+            # Counted without a lock; concurrent drops may be undercounted.
+            self.dropped += 1
+            return
+        headers = request.headers
+        entries.append(
+            (
+                time.time(),
+                address[0] if isinstance(address, tuple) else str(address) or "-",
+                request.method,
+                request.target,
+                request.version,
+                status,
+                size,
+                headers.get("Referer") or "-",
+                headers.get("User-Agent") or "-",
+                duration,
+            )
+        )
+        if len(entries) == self.batch_size:
+            self._wakeup.set()
+
+    @staticmethod
+    def body_size(response: Response, parts: list[bytes]) -> int:
+        """Body bytes of a response serialized into parts by serialize_parts()."""
+        if isinstance(response.body, FileRange):
+            return response.body.count
+        return len(parts[1]) if len(parts) > 1 else 0
+
+    def _run(self) -> None:
+        while self.running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._write_pending()
+        self._write_pending()
+
+    def _write_pending(self) -> None:
+        entries = self._entries
+        format_entry = _format_combined
+        if self.log_format == AccessLogFormat.JSON:
+            format_entry = _format_json
+        while entries:
+            count = min(len(entries), self.batch_size)
+            batch = [format_entry(entries.popleft()) for _ in range(count)]
+            stream = self._stream or sys.stdout
+            try:
+                stream.write("".join(batch))
+                stream.flush()
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not write access log: {e}")
+                self.dropped += count
+                continue
+            self.written += count
+
+
+def _format_combined(entry: _Entry) -> str:
+    when, client, method, target, version, status, size, referer, agent, _ = entry
+    timestamp = time.strftime("%d/%b/%Y:%H:%M:%S %z", time.localtime(when))
+    return (
+        f'{client} - - [{timestamp}] "{method} {_escape(target)} {version}" {status} '
+        f'{size or "-"} "{_escape(referer)}" "{_escape(agent)}"\n'
+    )
+
+
+def _format_json(entry: _Entry) -> str:
+    when, client, method, target, version, status, size, referer, agent, took = entry
+    return (
+        json.dumps(
+            {
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(when)),
+                "client": client,
+                "method": str(method),
+                "path": target,
+                "version": version,
+                "status": status,
+                "size": size,
+                "referer": referer,
+                "user_agent": agent,
+                "duration_ms": round(took * 1000, 3),
+            }
+        )
+        + "\n"
+    )
+
+
+# Quotes, backslashes and control characters, escaped as nginx does so a client
+# cannot end a field or forge a log line through the target or a header.
+_ESCAPES: dict[int, str] = {
+    **{code: f"\\x{code:02X}" for code in (*range(0x20), 0x7F)},
+    ord("\\"): "\\\\",
+    ord('"'): '\\"',
+}
+
+
+def _escape(value: str) -> str:
+    return value.translate(_ESCAPES)
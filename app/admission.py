@@ -0,0 +1,116 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from app.http.response import Response
+from app.http.status import Status
+
+
+class Priority(IntEnum):
+    """How readily a route's requests are shed under load.
+
+    CRITICAL routes, such as health checks, are always admitted. LOW routes are
+    shed first, once load reaches low_priority_share of the limits; NORMAL
+    routes only once the limits themselves are reached.
+    """
+
+    CRITICAL = 0
+    NORMAL = 1
+    LOW = 2
+
+
+@dataclass
+class AdmissionController:
+    """Sheds requests early when the server is overloaded.
+
+    Two signals are tracked: requests currently in a handler, and an
+    exponentially weighted moving average of how long readable connections waited
+    in the worker queue. Once either crosses its limit, admit() refuses new
+    requests, and the server answers them with a pre-serialized 503 Service
+    Unavailable carrying Retry-After instead of running the handler. Shed
+    requests release their worker at once, which drains the queue and brings the
+    wait back down.
+
+    The queue-wait average only reflects recent traffic: it is ignored once no
+    connection has been dequeued for window seconds.
+
+    Attributes:
+        max_in_flight (int | None): Requests allowed in handlers at once; None
+            leaves concurrency to the worker pool.
+        max_queue_wait (float): Average queue wait, in seconds, above which
+            requests are shed.
+        retry_after (int): Seconds sent in the Retry-After header.
+        low_priority_share (float): Fraction of both limits at which LOW priority
+            routes start being shed.
+        smoothing (float): Weight of the newest sample in the queue-wait average.
+        window (float): Seconds after which an unrefreshed average is ignored.
+    """
+
+    max_in_flight: int | None = None
+    max_queue_wait: float = 0.05
+    retry_after: int = 1
+    low_priority_share: float = 0.5
+    smoothing: float = 0.2
+    window: float = 1.0
+    in_flight: int = field(default=0, init=False)
+    queue_wait: float = field(default=0.0, init=False)
+    rejection: bytes = field(default=b"", init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._observed_at: float = 0.0
+        self.rejection = Response(
+            status=Status.SERVICE_UNAVAILABLE,
+            headers={
+                "Content-Type": "text/plain",
+                "Retry-After": str(self.retry_after),
+                "Connection": "close",
+            },
+            body="Server overloaded, retry later",
+        ).serialize()
+
+    def observe_queue_wait(self, seconds: float) -> None:
+        """Fold how long a connection waited for a worker into the average."""
+        # Lost updates between workers only nudge a smoothed value.
+        self.queue_wait += self.smoothing * (seconds - self.queue_wait)
+        self._observed_at = time.monotonic()
+
+    @property
+    def recent_queue_wait(self) -> float:
+        if time.monotonic() - self._observed_at > self.window:
+            return 0.0
+        return self.queue_wait
+
+    def admit(self, priority: "Priority" = Priority.NORMAL) -> bool:
+        """
+        Decide whether to run a request, counting it as in flight if so.
+
+        Args:
+            priority (Priority): The priority class of the request's route.
+
+        Returns:
+            bool: True if the request may run, in which case release() must be
+                called once it finishes; False if it should be shed.
+        """
+        if priority == Priority.CRITICAL:
+            return True
+
+        share = self.low_priority_share if priority == Priority.LOW else 1.0
+        if self.recent_queue_wait > self.max_queue_wait * share:
+            return False
+        with self._lock:
+            if (
+                self.max_in_flight is not None
+                and self.in_flight >= self.max_in_flight * share
+            ):
+                return False
+            self.in_flight += 1
+        return True
+
+    def release(self, priority: "Priority" = Priority.NORMAL) -> None:
+        """Mark a request admitted with the same priority as finished."""
+        if priority == Priority.CRITICAL:
+            return
+        with self._lock:
+            self.in_flight -= 1
@@ -0,0 +1,327 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.access_log import AccessLog
+from app.configs import settings
+from app.handler import BaseHandler
+from app.http.parser import ParseError, RequestParser
+from app.http.request import Request
+from app.http.response import FileRange, Response
+from app.http.status import Status
+from app.listener import listener_url, open_listener, systemd_listen_fd
+from app.metrics import UNMATCHED_ROUTE, Metrics, default_metrics
+from app.router import Router
+from app.server import CONTINUE, drop_unsendable_body, set_keep_alive
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHttpServer:
+    """HTTP server engine built on asyncio streams.
+
+    Serves the same ``Router``, ``Request`` and ``Response`` objects as
+    ``HttpServer``, but every connection is a task on a single event loop instead
+    of an OS thread, so idle keep-alive clients cost a few kilobytes each.
+    Handlers defining ``async def`` methods run on the loop; synchronous handlers
+    are dispatched to a thread pool.
+    """
+
+    _CONNECTION_TIMEOUT: int = 30
+    _MAX_PIPELINE: int = 32
+    _DEFAULT_EXECUTOR_WORKERS: int = 32
+    _DEFAULT_MAX_KEEP_ALIVE_REQUESTS: int = 100
+
+    def __init__(
+        self,
+        host: str = settings.host,
+        port: int = settings.port,
+        unix_socket: str | None = settings.unix_socket,
+        unix_socket_mode: int = settings.unix_socket_mode,
+        listen_fd: int | None = settings.listen_fd,
+        max_keep_alive_requests: int | None = settings.max_keep_alive_requests,
+        max_request_timeout: int | None = settings.max_request_timeout,
+        metrics: Metrics = default_metrics,
+        access_log: AccessLog | None = None,
+    ) -> None:
+        self.host: str = host
+        self.port: int = port
+        self.unix_socket: str | None = unix_socket
+        self.unix_socket_mode: int = unix_socket_mode
+        self.listen_fd: int | None = (
+            listen_fd if listen_fd is not None else systemd_listen_fd()
+        )
+        self.router = Router()
+        self.max_keep_alive_requests: int = (
+            max_keep_alive_requests or self._DEFAULT_MAX_KEEP_ALIVE_REQUESTS
+        )
+        self.request_timeout: int = max_request_timeout or self._CONNECTION_TIMEOUT
+        self.metrics: Metrics = metrics
+        self.access_log: AccessLog | None = access_log
+        self.running: bool = False
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.max_connections or self._DEFAULT_EXECUTOR_WORKERS,
+            thread_name_prefix="http-handler",
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.Server | None = None
+
+    def run(self) -> None:
+        """
+        Run the HTTP server.
+
+        Starts an event loop on the current thread and serves connections until
+        shutdown() is called or a KeyboardInterrupt is received.
+        """
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("Server stopped")
+
+    async def serve(self) -> None:
+        """Serve connections on the running event loop until the server is closed."""
+        self._loop = asyncio.get_running_loop()
+        sock = open_listener(
+            self.host,
+            self.port,
+            unix_socket=self.unix_socket,
+            unix_socket_mode=self.unix_socket_mode,
+            listen_fd=self.listen_fd,
+        )
+        self._server = await asyncio.start_server(self._handle_connection, sock=sock)
+        self.running = True
+        if self.access_log is not None:
+            self.access_log.start()
+        logger.info(f"Async server started on {listener_url(sock)}")
+        logger.info("Press Ctrl+C to stop")
+
+        try:
+            async with self._server:
+                try:
+                    await self._server.serve_forever()
+                except asyncio.CancelledError:
+                    pass
+        finally:
+            if self.listen_fd is None and self.unix_socket is not None:
+                try:
+                    os.unlink(self.unix_socket)
+                except OSError:
+                    pass
+            if self.access_log is not None:
+                # Joins the writer thread after it writes what is still pending.
+                self.access_log.stop()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        address = writer.get_extra_info("peername")
+        parser = RequestParser()
+        served = 0
+        # Connection tasks all run on the loop thread, so they share its shard.
+        metrics = self.metrics.shard()
+        metrics.connections_opened += 1
+        try:
+            keep_alive = True
+            while keep_alive and self.running:
+                try:
+                    request = await self._read_request(reader, writer, parser)
+                    if request is None:
+                        break
+
+                    buffers: list[bytes] = []
+                    batched = 0
+                    while request is not None:
+                        started = time.perf_counter()
+                        served += 1
+                        response, keep_alive = await self._handle_request(
+                            request, served
+                        )
+                        parts = response.serialize_parts(request.version != "HTTP/1.0")
+                        buffers.extend(parts)
+                        batched += 1
+                        if response.is_streaming:
+                            metrics.bytes_sent += sum(map(len, buffers))
+                            writer.writelines(buffers)
+                            buffers = []
+                            if not await self._stream_body(writer, response):
+                                keep_alive = False
+                        duration = time.perf_counter() - started
+                        metrics.observe_request(
+                            request.metadata.route or UNMATCHED_ROUTE,
+                            request.method,
+                            response.status.code,
+                            duration,
+                        )
+                        if self.access_log is not None:
+                            self.access_log.log(
+                                address,
+                                request,
+                                response.status.code,
+                                AccessLog.body_size(response, parts),
+                                duration,
+                            )
+                        if not keep_alive or batched >= self._MAX_PIPELINE:
+                            break
+                        try:
+                            request = parser.next_request()
+                        except ParseError as e:
+                            buffers.append(self._reject(address, e))
+                            keep_alive = False
+                            break
+
+                    metrics.bytes_sent += sum(map(len, buffers))
+                    writer.writelines(buffers)
+                    await writer.drain()
+
+                except asyncio.TimeoutError:
+                    logger.debug(f"Connection from {address} timed out")
+                    if parser.in_progress:
+                        writer.write(
+                            Response(
+                                status=Status.REQUEST_TIMEOUT,
+                                headers={"Connection": "close"},
+                            ).serialize()
+                        )
+                        await writer.drain()
+                    keep_alive = False
+
+                except ParseError as e:
+                    writer.write(self._reject(address, e))
+                    await writer.drain()
+                    keep_alive = False
+
+                except OSError as e:
+                    logger.debug(f"Connection from {address} failed: {e}")
+                    keep_alive = False
+
+        finally:
+            metrics.connections_closed += 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _read_request(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        parser: RequestParser,
+    ) -> Request | None:
+        # Same limits as the threaded engine: request_timeout to wait for the next
+        # request, and the same window to receive the rest once it has started.
+        request = parser.next_request()
+        loop = asyncio.get_running_loop()
+        deadline: float | None = None
+        while request is None:
+            if parser.continue_expected():
+                writer.write(CONTINUE)
+            timeout: float = self.request_timeout
+            if parser.in_progress:
+                if deadline is None:
+                    deadline = loop.time() + self.request_timeout
+                timeout = deadline - loop.time()
+            else:
+                # Idle between requests; don't hold a buffer while waiting.
+                parser.release()
+            data = await asyncio.wait_for(reader.read(parser.RECV_SIZE), timeout)
+            if not data:
+                return None
+            self.metrics.shard().bytes_received += len(data)
+            parser.feed(data)
+            request = parser.next_request()
+        return request
+
+    async def _handle_request(
+        self, request: Request, served: int
+    ) -> tuple[Response, bool]:
+        try:
+            response = await self._dispatch(request)
+        except Exception as e:
+            logger.error(f"Error handling request: {e}")
+            response = Response(status=Status.INTERNAL_SERVER_ERROR)
+
+        drop_unsendable_body(request, response)
+        keep_alive = set_keep_alive(
+            request,
+            response,
+            served,
+            self.max_keep_alive_requests,
+            self.request_timeout,
+        )
+        return response, keep_alive and self.running
+
+    async def _stream_body(
+        self, writer: asyncio.StreamWriter, response: Response
+    ) -> bool:
+        # Body iterators are synchronous; draining after every chunk keeps the
+        # transport buffer bounded for slow clients.
+        metrics = self.metrics.shard()
+        try:
+            if isinstance(response.body, FileRange):
+                await self._send_file(writer, response.body)
+                metrics.bytes_sent += response.body.count
+                return True
+            for parts in response.iter_body_parts():
+                metrics.bytes_sent += sum(map(len, parts))
+                writer.writelines(parts)
+                await writer.drain()
+        except OSError:
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming response body: {e}")
+            return False
+        return True
+
+    async def _send_file(
+        self, writer: asyncio.StreamWriter, file_range: FileRange
+    ) -> None:
+        try:
+            await writer.drain()
+            await asyncio.get_running_loop().sendfile(
+                writer.transport, file_range.file, file_range.offset, file_range.count
+            )
+        finally:
+            file_range.file.close()
+
+    async def _dispatch(self, request: Request) -> Response:
+        handler, path_params, route = self.router.match(request.path)
+        request.metadata.route = route
+        if handler is None:
+            return Response(status=Status.NOT_FOUND)
+
+        request.metadata.path_params.update(path_params)
+        if isinstance(handler, BaseHandler):
+            return await handler.call_async(request, self.executor)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, handler, request)
+
+    def _reject(self, address: str, error: ParseError) -> bytes:
+        logger.warning(f"Rejected request from {address}: {error}")
+        return Response(
+            status=error.status, headers={"Connection": "close"}
+        ).serialize()
+
+    def shutdown(self) -> None:
+        """
+        Gracefully shuts down the server.
+
+        Safe to call from any thread. Stops accepting connections and lets in-flight
+        requests finish their current response before their connections close.
+        """
+        logger.info("Shutting down server...")
+        self.running = False
+        if self._loop is None or self._server is None:
+            return
+
+        server = self._server
+        try:
+            self._loop.call_soon_threadsafe(server.close)
+        except RuntimeError:
+            pass
@@ -0,0 +1,260 @@
+import hashlib
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+from app.http.request import Request, split_target
+from app.http.response import Response
+from app.http.status import Status
+
+if TYPE_CHECKING:
+    from app.handler import BaseHandler
+
+HandlerType = TypeVar("HandlerType", bound="type[BaseHandler]")
+
+# Per-entry bookkeeping that is not part of the stored body or headers.
+_ENTRY_OVERHEAD = 256
+
+# Headers of a cached 200 that a 304 standing in for it must repeat (RFC 9110
+# section 15.4.5), so downstream caches keep the right variant and lifetime.
+_NOT_MODIFIED_HEADERS = ("Cache-Control", "Expires", "Vary")
+
+_caches: "weakref.WeakSet[ResponseCache]" = weakref.WeakSet()
+
+
+@dataclass
+class CacheEntry:
+    status: Status
+    headers: dict
+    body: bytes
+    etag: str
+    expires_at: float
+    size: int
+
+    def to_response(self) -> Response:
+        return Response(status=self.status, headers=dict(self.headers), body=self.body)
+
+
+class ResponseCache:
+    """Thread-safe in-memory cache of GET responses.
+
+    Entries are keyed on path, query string and the values of the request headers
+    the response listed in ``Vary``. The cache is bounded by a memory budget and
+    evicts least recently used entries first; entries also expire after their
+    TTL. Every stored entry gets an ETag so conditional requests can be answered
+    with 304 without calling the handler.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_bytes: int = 16 * 1024 * 1024) -> None:
+        self.ttl: float = ttl
+        self.max_bytes: int = max_bytes
+        self.size: int = 0
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._vary: dict[tuple[str, str], tuple[str, ...]] = {}
+        self._paths: dict[str, set[tuple]] = {}
+        self._lock = threading.Lock()
+        _caches.add(self)
+
+    def lookup(self, request: Request) -> Response | None:
+        """
+        Return the cached response for a GET request, if there is a fresh one.
+
+        Args:
+            request (Request): The incoming GET request.
+
+        Returns:
+            Response | None: A copy of the cached response, a 304 reply if the
+                request's If-None-Match matches it, or None on a miss.
+        """
+        base_key = _base_key(request)
+        now = time.monotonic()
+        with self._lock:
+            vary = self._vary.get(base_key)
+            if vary is None:
+                return None
+            key = (base_key, _vary_values(request, vary))
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= now:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+
+        if _etag_matches(request, entry.etag):
+            return _not_modified(entry.etag, entry.headers)
+        return entry.to_response()
+
+    def store(
+        self, request: Request, response: Response, ttl: float | None = None
+    ) -> Response:
+        """
+        Cache a fully built response to a GET request when it is cacheable.
+
+        Only 200 responses with a fixed body and no Cache-Control: no-store or
+        private are stored. An ETag is added if the handler did not set one.
+
+        Args:
+            request (Request): The GET request the response answers.
+            response (Response): The finalized response.
+            ttl (float | None): Lifetime in seconds, defaults to the cache's TTL.
+
+        Returns:
+            Response: The response to send, which is a 304 reply if the request's
+                If-None-Match matches the new entry.
+        """
+        body = response.body
+        if response.status != Status.OK or not isinstance(body, (str, bytes)):
+            return response
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control or "private" in cache_control:
+            return response
+        if "Set-Cookie" in response.headers:
+            return response
+
+        body_bytes = body.encode() if isinstance(body, str) else body
+        etag = response.headers.get("ETag")
+        if etag is None:
+            digest = hashlib.blake2b(body_bytes, digest_size=12)
+            etag = response.headers["ETag"] = f'"{digest.hexdigest()}"'
+
+        vary = tuple(
+            name.strip()
+            for name in response.headers.get("Vary", "").split(",")
+            if name.strip()
+        )
+        headers = dict(response.headers)
+        size = len(body_bytes) + _ENTRY_OVERHEAD
+        size += sum(len(str(key)) + len(str(value)) for key, value in headers.items())
+        base_key = _base_key(request)
+        key = (base_key, _vary_values(request, vary))
+        entry = CacheEntry(
+            status=response.status,
+            headers=headers,
+            body=body_bytes,
+            etag=etag,
+            expires_at=time.monotonic() + (self.ttl if ttl is None else ttl),
+            size=size,
+        )
+
+        if size <= self.max_bytes:
+            with self._lock:
+                if self._vary.get(base_key, vary) != vary:
+                    self._invalidate_base(base_key)
+                self._remove(key)
+                self._vary[base_key] = vary
+                self._entries[key] = entry
+                self._paths.setdefault(base_key[0], set()).add(key)
+                self.size += size
+                while self.size > self.max_bytes:
+                    self._remove(next(iter(self._entries)))
+
+        if _etag_matches(request, etag):
+            return _not_modified(etag, headers)
+        return response
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop entries for a resource, its parent collection and its sub-resources.
+
+        A write to /todos/1 therefore also invalidates /todos, and a write to
+        /todos invalidates /todos/1. The root is nobody's collection: only a write
+        to / itself invalidates it, so writes elsewhere leave the home page cached.
+        """
+        path = split_target(path)[0].rstrip("/") or "/"
+        with self._lock:
+            for cached_path in list(self._paths):
+                if _related(path, cached_path.rstrip("/") or "/"):
+                    for key in list(self._paths.get(cached_path, ())):
+                        self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._vary.clear()
+            self._paths.clear()
+            self.size = 0
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= entry.size
+        base_key = key[0]
+        keys = self._paths.get(base_key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._paths[base_key[0]]
+        if not any(other[0] == base_key for other in keys or ()):
+            self._vary.pop(base_key, None)
+
+    def _invalidate_base(self, base_key: tuple[str, str]) -> None:
+        keys = self._paths.get(base_key[0], ())
+        for key in [key for key in keys if key[0] == base_key]:
+            self._remove(key)
+
+
+default_response_cache = ResponseCache()
+
+
+def invalidate_cached_path(path: str) -> None:
+    """Invalidate a resource path in every live ResponseCache."""
+    for cache in list(_caches):
+        cache.invalidate(path)
+
+
+def cache_responses(
+    ttl: float | None = None, cache: ResponseCache | None = None
+) -> Callable[[HandlerType], HandlerType]:
+    """
+    Class decorator that serves a handler's GET responses from a ResponseCache.
+
+    Args:
+        ttl (float | None): Entry lifetime, defaults to the cache's TTL.
+        cache (ResponseCache | None): Cache to use, defaults to the shared
+            default_response_cache so writes through other handlers invalidate it.
+    """
+
+    def decorator(handler_class: HandlerType) -> HandlerType:
+        handler_class.response_cache = cache or default_response_cache
+        handler_class.response_cache_ttl = ttl
+        return handler_class
+
+    return decorator
+
+
+def _base_key(request: Request) -> tuple[str, str]:
+    return request.path, request.query_string
+
+
+def _vary_values(request: Request, vary: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple(request.headers.get(name, "") for name in vary)
+
+
+def _related(path: str, other: str) -> bool:
+    if path == other:
+        return True
+    if path == "/" or other == "/":
+        return False
+    return other.startswith(path + "/") or other == path.rpartition("/")[0]
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _not_modified(etag: str, headers: dict) -> Response:
+    not_modified = {"ETag": etag}
+    for name in _NOT_MODIFIED_HEADERS:
+        value = headers.get(name)
+        if value is not None:
+            not_modified[name] = value
+    return Response(status=Status.NOT_MODIFIED, headers=not_modified)
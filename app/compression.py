@@ -0,0 +1,195 @@
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import StrEnum
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from app.metrics import Metrics, default_metrics
+
+
+class CompressionType(StrEnum):
+    GZIP = "gzip"
+    DEFLATE = "deflate"
+
+
+CompressionTypes = (CompressionType.GZIP, CompressionType.DEFLATE)
+
+_WBITS = {
+    CompressionType.GZIP: 16 + zlib.MAX_WBITS,
+    CompressionType.DEFLATE: zlib.MAX_WBITS,
+}
+
+DEFAULT_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+
+
+def negotiate_encoding(
+    accept_encoding: str, supported: Iterable[CompressionType] = CompressionTypes
+) -> CompressionType | None:
+    """
+    Pick a content coding from an Accept-Encoding header.
+
+    Honours q-values, including q=0 to refuse a coding, and "*" for codings the
+    client did not list. Among codings with equal weight the order of supported
+    decides.
+
+    Args:
+        accept_encoding (str): The Accept-Encoding header value.
+        supported (Iterable[CompressionType]): Codings the server can produce, in
+            order of preference.
+
+    Returns:
+        CompressionType | None: The coding to use, or None to send the body as-is.
+    """
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for token in accept_encoding.lower().split(","):
+        coding, _, params = token.partition(";")
+        weight = 1.0
+        name, _, value = params.partition("=")
+        if name.strip() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip()] = weight
+
+    wildcard = weights.get("*", 0.0)
+    best: CompressionType | None = None
+    best_weight = 0.0
+    for coding in supported:
+        weight = weights.get(coding.value, wildcard)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+# Clients send a handful of distinct Accept-Encoding values; parse each once.
+_negotiate_cached = lru_cache(maxsize=256)(negotiate_encoding)
+
+
+class CompressionCache:
+    """Thread-safe LRU of compressed bodies keyed by a hash of their content.
+
+    Bounded both by entry count and by the total size of the stored compressed
+    bodies, so repeated identical responses are compressed once.
+    """
+
+    def __init__(
+        self, max_entries: int = 256, max_bytes: int = 8 * 1024 * 1024
+    ) -> None:
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.size: int = 0
+        self._entries: OrderedDict[tuple[bytes, str, int], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[bytes, str, int]) -> bytes | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: tuple[bytes, str, int], value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = value
+            self.size += len(value)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+@dataclass
+class CompressionPolicy:
+    """Decides whether and how response bodies are compressed.
+
+    Bodies smaller than min_size, or whose Content-Type does not start with one of
+    content_types, are sent as-is. Fixed bodies are looked up in the cache by
+    content hash before being compressed; streaming bodies are compressed chunk by
+    chunk and never cached.
+    """
+
+    min_size: int = 1024
+    level: int = 6
+    content_types: tuple[str, ...] = DEFAULT_COMPRESSIBLE_TYPES
+    encodings: tuple[CompressionType, ...] = CompressionTypes
+    cache: CompressionCache | None = field(default_factory=CompressionCache)
+    metrics: Metrics | None = default_metrics
+
+    def negotiate(self, accept_encoding: str) -> CompressionType | None:
+        return _negotiate_cached(accept_encoding, self.encodings)
+
+    def is_compressible(self, content_type: str) -> bool:
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        return media_type.startswith(self.content_types)
+
+    def compress(self, body: bytes, encoding: CompressionType) -> bytes:
+        if self.cache is None:
+            compressed = self._compress(body, encoding)
+        else:
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            key = (digest, encoding, self.level)
+            cached = self.cache.get(key)
+            if cached is None:
+                cached = self._compress(body, encoding)
+                self.cache.put(key, cached)
+            compressed = cached
+
+        if self.metrics is not None:
+            self.metrics.shard().observe_compression(len(body), len(compressed))
+        return compressed
+
+    def compress_stream(
+        self, chunks: Iterable[bytes], encoding: CompressionType
+    ) -> Iterator[bytes]:
+        """
+        Compress a streaming body chunk by chunk.
+
+        Each input chunk is sync-flushed so the client can decode it as soon as it
+        arrives; memory use stays at one chunk plus the compressor window.
+        """
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, _WBITS[encoding])
+        input_size = output_size = 0
+        for chunk in chunks:
+            if chunk:
+                compressed = compressor.compress(chunk) + compressor.flush(
+                    zlib.Z_SYNC_FLUSH
+                )
+                input_size += len(chunk)
+                output_size += len(compressed)
+                yield compressed
+        compressed = compressor.flush()
+        if self.metrics is not None:
+            self.metrics.shard().observe_compression(
+                input_size, output_size + len(compressed)
+            )
+        yield compressed
+
+    def _compress(self, body: bytes, encoding: CompressionType) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, _WBITS[encoding])
+        return compressor.compress(body) + compressor.flush()
+
+
+DEFAULT_COMPRESSION_POLICY = CompressionPolicy()
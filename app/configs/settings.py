@@ -13,13 +13,19 @@ def setup_logging() -> None:
 class Settings:
     host: str
     port: int
+    unix_socket: str | None = None
+    unix_socket_mode: int = 0o660
+    listen_fd: int | None = None
     allowed_origins: list[str] | None = None
     max_connections: int | None = None
+    max_pending_connections: int | None = None
     max_request_size: int | None = None
+    request_spool_threshold: int | None = None
     max_response_size: int | None = None
     max_request_timeout: int | None = None
     max_response_timeout: int | None = None
     max_keep_alive_requests: int | None = None
+    workers: int | None = None
 
     def __post_init__(self) -> None:
         setup_logging()
@@ -1,64 +1,218 @@
-import gzip
+import asyncio
+import inspect
 import logging
-from collections import namedtuple
-from enum import StrEnum
-from typing import Callable
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable, Iterator
 
+from app.cache import ResponseCache, invalidate_cached_path
+from app.compression import (
+    DEFAULT_COMPRESSION_POLICY,
+    CompressionPolicy,
+    CompressionType,
+)
 from app.http.methods import HttpMethod
-from app.http.request import Request
-from app.http.response import Response
+from app.http.request import InvalidRequestBodyError, Request
+from app.http.response import FileRange, Response
 from app.http.status import Status
+from app.timing import Phase
 
 logger = logging.getLogger(__name__)
 
-RouteParams = namedtuple("RouteParams", ["path_params", "query_params"])
+# Methods whose successful responses make cached reads of a resource stale.
+_UNSAFE_METHODS = frozenset(
+    (HttpMethod.POST, HttpMethod.PUT, HttpMethod.PATCH, HttpMethod.DELETE)
+)
 
 
-class CompressionType(StrEnum):
-    GZIP = "gzip"
-
-
-CompressionTypes = (CompressionType.GZIP,)
+class BaseHandler:
+    """Base class for request handlers, dispatching on the request method.
 
+    Each subclass gets a dispatch table from HTTP method to handler function,
+    built once when the class is defined. Methods a subclass does not implement
+    are answered with 405 Method Not Allowed and an Allow header listing the ones
+    it does, precomputed with the table; OPTIONS is answered with that header
+    too. HEAD runs the GET handler and sends its headers without the body, which
+    is neither compressed nor cached.
+    """
 
-class BaseHandler:
     _METHODS_MAP = {
         HttpMethod.GET: "get",
+        HttpMethod.HEAD: "get",
         HttpMethod.POST: "post",
         HttpMethod.PUT: "put",
         HttpMethod.PATCH: "patch",
         HttpMethod.DELETE: "delete",
+        HttpMethod.OPTIONS: "options",
     }
+    # Default implementations that only answer 405 and don't count as allowed.
+    _NOT_ALLOWED_DEFAULTS = ("post", "put", "patch", "delete")
+    _dispatch_table: dict[HttpMethod, Callable]
+    _allow: str
+    compression_policy: CompressionPolicy | None = DEFAULT_COMPRESSION_POLICY
+    response_cache: ResponseCache | None = None
+    response_cache_ttl: float | None = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._build_dispatch_table()
+
+    @classmethod
+    def _build_dispatch_table(cls) -> None:
+        table: dict[HttpMethod, Callable] = {}
+        for method, name in cls._METHODS_MAP.items():
+            func = getattr(cls, name, None)
+            if func is None:
+                continue
+            if name in cls._NOT_ALLOWED_DEFAULTS and func is getattr(BaseHandler, name):
+                continue
+            table[method] = func
+        cls._dispatch_table = table
+        cls._allow = ", ".join(method.value for method in table)
 
     def __call__(self, request: Request) -> Response:
-        compression_type = request.headers.get("Accept-Encoding", "").lower()
-        compression_type_list = compression_type.split(",")
-        compression_type_list = [_type.strip() for _type in compression_type_list]
+        method_func = self._dispatch_table.get(request.method)
+        if method_func is None:
+            return self._method_not_allowed()
+        cached = self._cached_response(request)
+        if cached is not None:
+            return cached
+        return self._dispatch(request, method_func)
+
+    async def call_async(
+        self, request: Request, executor: Executor | None = None
+    ) -> Response:
+        """Handles a request from inside a running event loop.
 
-        method = self._METHODS_MAP[request.method]
-        method_func: Callable[[Request], Response] | None = getattr(self, method, None)
+        Coroutine methods (``async def get(...)``) are awaited directly on the loop.
+        Plain methods are run through ``__call__`` in the given executor so blocking
+        handlers never stall the loop.
+
+        Args:
+            request (Request): The incoming HTTP request object.
+            executor (Executor | None): Executor for synchronous handlers. Defaults to
+                the loop's default executor.
+
+        Returns:
+            Response: The handler's response, compressed if the client allows it.
+        """
+        method_func = self._dispatch_table.get(request.method)
         if method_func is None:
-            return Response(status=Status.METHOD_NOT_ALLOWED)
-        response = method_func(request)
+            return self._method_not_allowed()
+        cached = self._cached_response(request)
+        if cached is not None:
+            return cached
+        if not inspect.iscoroutinefunction(method_func):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, self._dispatch, request, method_func
+            )
+
+        try:
+            response = await method_func(self, request)
+        except InvalidRequestBodyError as e:
+            return Response(status=Status.BAD_REQUEST, body=str(e))
+        return self._complete_response(request, response)
 
-        compression_is_permitted = (
-            compression_type and CompressionType.GZIP.value in compression_type_list
+    def _dispatch(self, request: Request, method_func: Callable) -> Response:
+        try:
+            response = method_func(self, request)
+            if inspect.isawaitable(response):
+                # Coroutine handlers served by the threaded engine get their own loop.
+                response = asyncio.run(response)  # type: ignore[arg-type]
+        except InvalidRequestBodyError as e:
+            # The body is decoded when the handler first reads request.body.
+            return Response(status=Status.BAD_REQUEST, body=str(e))
+
+        return self._complete_response(request, response)
+
+    def _complete_response(self, request: Request, response: Response) -> Response:
+        if request.method == HttpMethod.HEAD:
+            return response.omit_body()
+        return self._cache_response(request, self._finalize_response(request, response))
+
+    def _method_not_allowed(self) -> Response:
+        return Response(
+            status=Status.METHOD_NOT_ALLOWED,
+            headers={"Content-Type": "text/plain", "Allow": self._allow},
         )
-        if compression_is_permitted:
-            response.headers["Content-Encoding"] = CompressionType.GZIP
-        if response.body and compression_is_permitted:
-            response.body = self._compress_response_body(
-                response.body, CompressionType.GZIP  # type: ignore
-            )
+
+    def _cached_response(self, request: Request) -> Response | None:
+        if self.response_cache is None:
+            return None
+        if request.method == HttpMethod.GET:
+            return self.response_cache.lookup(request)
+        if request.method == HttpMethod.HEAD:
+            cached = self.response_cache.lookup(request)
+            return cached.omit_body() if cached is not None else None
+        return None
+
+    def _cache_response(self, request: Request, response: Response) -> Response:
+        if request.method == HttpMethod.GET:
+            if self.response_cache is None:
+                return response
+            return self.response_cache.store(request, response, self.response_cache_ttl)
+
+        # A successful write through any handler makes cached reads of the same
+        # resource, its collection and its sub-resources stale.
+        if request.method in _UNSAFE_METHODS and response.status.code < 400:
+            invalidate_cached_path(request.path)
+        return response
+
+    def _finalize_response(self, request: Request, response: Response) -> Response:
+        # File ranges go out with sendfile and encoded bodies are already final.
+        if "Content-Encoding" in response.headers or isinstance(
+            response.body, FileRange
+        ):
+            return response
+
+        policy = self.compression_policy
+        if policy is None or not response.body:
+            return response
+        if not policy.is_compressible(response.headers.get("Content-Type", "")):
+            return response
+
+        data = b""
+        body = response.body
+        if isinstance(body, (str, bytes)):
+            data = body.encode() if isinstance(body, str) else body
+            if len(data) < policy.min_size:
+                return response
+
+        vary = response.headers.get("Vary")
+        if not vary:
+            response.headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            response.headers["Vary"] = f"{vary}, Accept-Encoding"
+
+        encoding = policy.negotiate(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        if response.is_streaming:
+            response.headers.pop("Content-Length", None)
+            response.body = self._compress_stream(response.iter_body(), encoding)
+        else:
+            timer = request.metadata.timer
+            started = time.perf_counter_ns() if timer is not None else 0
+            response.body = self._compress_response_body(data, encoding)
+            if timer is not None:
+                timer.record(Phase.COMPRESS, started)
+        response.headers["Content-Encoding"] = encoding.value
 
         return response
 
     def _compress_response_body(
-        self, body: str, compression_type: CompressionType
-    ) -> str | bytes:
-        if body and compression_type == CompressionType.GZIP:
-            return gzip.compress(body.encode())
-        return body
+        self, body: bytes, compression_type: CompressionType
+    ) -> bytes:
+        assert self.compression_policy is not None
+        return self.compression_policy.compress(body, compression_type)
+
+    def _compress_stream(
+        self, chunks: Iterable[bytes], compression_type: CompressionType
+    ) -> Iterator[bytes]:
+        assert self.compression_policy is not None
+        return self.compression_policy.compress_stream(chunks, compression_type)
 
     def get(self, request: Request) -> Response:
         """Handles GET requests.
@@ -74,6 +228,18 @@ class BaseHandler:
         """
         return Response(status=Status.OK)
 
+    def options(self, request: Request) -> Response:
+        """Handles OPTIONS requests.
+
+        Args:
+            request (Request): The incoming HTTP request object.
+
+        Returns:
+            Response: A Response object with HTTP 200 OK status code, an empty body
+                and an Allow header listing the methods the handler implements.
+        """
+        return Response(headers={"Content-Type": "text/plain", "Allow": self._allow})
+
     def post(self, request: Request) -> Response:
         """Handles POST requests.
 
@@ -129,3 +295,6 @@ class BaseHandler:
                 handling.
         """
         return Response(status=Status.METHOD_NOT_ALLOWED)
+
+
+BaseHandler._build_dispatch_table()
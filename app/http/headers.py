@@ -0,0 +1,163 @@
+import logging
+from typing import Iterable, Iterator, Mapping, MutableMapping, TypeVar, overload
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class Headers(MutableMapping[str, str]):
+    """
+    Case-insensitive multi-dict of request headers, parsed lazily from raw bytes.
+
+    The parser hands over the header block as received and nothing is decoded
+    until a header is read. A lookup before the first full parse searches the raw
+    bytes for that one name, so the server can check Connection or Content-Length
+    without building the mapping; reading a repeated header, iterating, or
+    writing parses the whole block.
+
+    A name may carry several values: headers[name] joins them with ", " as RFC
+    9110 allows for list-valued fields, getall(name) returns them separately and
+    add(name, value) appends one. Names keep the case the client sent them in.
+    """
+
+    __slots__ = ("_raw", "_lowered", "_store")
+
+    def __init__(
+        self, data: Mapping[str, str] | Iterable[tuple[str, str]] | None = None
+    ) -> None:
+        self._raw: bytes = b""
+        self._lowered: bytes | None = None
+        self._store: dict[str, list[tuple[str, str]]] | None = {}
+        if data is not None:
+            self.update(data)
+
+    @classmethod
+    def from_raw(cls, raw: bytes) -> "Headers":
+        """
+        Wrap a received header block without parsing it.
+
+        Args:
+            raw (bytes): The header lines, each preceded by CRLF, i.e. the request
+                head after the request line and without the blank line ending it.
+
+        Returns:
+            Headers: A mapping that parses raw on first use.
+        """
+        headers = cls.__new__(cls)
+        headers._raw = raw
+        headers._lowered = None
+        headers._store = None
+        return headers
+
+    def __getitem__(self, key: str) -> str:
+        value = self._lookup(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: str) -> None:
+        self._parsed()[key.lower()] = [(key, value)]
+
+    def __delitem__(self, key: str) -> None:
+        del self._parsed()[key.lower()]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._lookup(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (values[0][0] for values in self._parsed().values())
+
+    def __len__(self) -> int:
+        return len(self._parsed())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        other_items = Headers(other).lower_items()
+        return dict(self.lower_items()) == dict(other_items)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self.multi_items())!r})"
+
+    @overload
+    def get(self, key: str, /) -> str | None:
+        ...
+
+    @overload
+    def get(self, key: str, /, default: str | _T) -> str | _T:
+        ...
+
+    def get(self, key: str, /, default: object = None) -> object:
+        value = self._lookup(key)
+        return default if value is None else value
+
+    def getall(self, key: str) -> list[str]:
+        """Return every value of a header in the order received, or []."""
+        return [value for _, value in self._parsed().get(key.lower(), ())]
+
+    def add(self, key: str, value: str) -> None:
+        """Append a value, keeping any the header already has."""
+        self._parsed().setdefault(key.lower(), []).append((key, value))
+
+    def multi_items(self) -> Iterator[tuple[str, str]]:
+        """Yield (name, value) for every value, repeated headers included."""
+        return (item for values in self._parsed().values() for item in values)
+
+    def lower_items(self) -> Iterator[tuple[str, str]]:
+        return ((key, self[key]) for key in self._parsed())
+
+    def copy(self) -> "Headers":
+        if self._store is None:
+            return Headers.from_raw(self._raw)
+        headers = Headers()
+        for key, value in self.multi_items():
+            headers.add(key, value)
+        return headers
+
+    def _lookup(self, key: str) -> str | None:
+        lowered_key = key.lower()
+        if self._store is None:
+            # Answer from the raw bytes when the header is absent or occurs once;
+            # a repeated header needs the full parse to collect its values.
+            if self._lowered is None:
+                self._lowered = self._raw.lower()
+            needle = b"\r\n" + lowered_key.encode("latin-1") + b":"
+            start = self._lowered.find(needle)
+            if start == -1:
+                return None
+            start += len(needle)
+            end = self._lowered.find(b"\r\n", start)
+            if end == -1:
+                return self._raw[start:].strip().decode("latin-1")
+            if self._lowered.find(needle, end) == -1:
+                return self._raw[start:end].strip().decode("latin-1")
+
+        values = self._parsed().get(lowered_key)
+        if not values:
+            return None
+        if len(values) == 1:
+            return values[0][1]
+        return ", ".join(value for _, value in values)
+
+    def _parsed(self) -> dict[str, list[tuple[str, str]]]:
+        if self._store is not None:
+            return self._store
+        store: dict[str, list[tuple[str, str]]] = {}
+        for line in self._raw.split(b"\r\n"):
+            if not line:
+                continue
+            name, separator, value = line.partition(b":")
+            # Whitespace around the name is invalid (RFC 9112, section 5.1); such
+            # lines are dropped here and never matched by _lookup either.
+            if not separator or not name or name != name.strip():
+                logger.warning(f"Invalid header line: {line!r}, ignoring header")
+                continue
+            key = name.decode("latin-1")
+            store.setdefault(key.lower(), []).append(
+                (key, value.strip().decode("latin-1"))
+            )
+        self._store = store
+        self._raw = b""
+        self._lowered = None
+        return store
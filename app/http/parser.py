@@ -0,0 +1,291 @@
+import logging
+import socket
+import tempfile
+
+from app.configs import settings
+from app.http.headers import Headers
+from app.http.methods import HttpMethod
+from app.http.request import Request
+from app.http.status import Status
+
+logger = logging.getLogger(__name__)
+
+
+class ParseError(ValueError):
+    """Raised when the buffered bytes are not a valid HTTP/1.x request."""
+
+    status: Status = Status.BAD_REQUEST
+
+
+class RequestTooLargeError(ParseError):
+    status = Status.PAYLOAD_TOO_LARGE
+
+
+class HeadersTooLargeError(ParseError):
+    status = Status.REQUEST_HEADER_FIELDS_TOO_LARGE
+
+
+class UnsupportedMethodError(ParseError):
+    status = Status.NOT_IMPLEMENTED
+
+
+_HEADERS = 0
+_BODY = 1
+_CHUNK_SIZE = 2
+_CHUNK_DATA = 3
+_CHUNK_END = 4
+_TRAILERS = 5
+
+
+class RequestParser:
+    """Incremental HTTP/1.x request parser for a single connection.
+
+    Received bytes land in one reusable bytearray, filled with ``recv_into`` or
+    ``feed``. It is allocated on the first read and can be dropped with release()
+    between requests, so idle keep-alive connections hold no buffer. Each call to
+    ``next_request`` only scans bytes that arrived since the previous call, so
+    reading a request costs O(request size) however it is split across reads.
+    Bodies are read exactly by ``Content-Length`` or decoded from chunked transfer
+    encoding, and bytes after a complete request stay buffered for the next one.
+
+    Bodies larger than spool_threshold are written to a spooled temporary file as
+    they arrive instead of being held in memory. A request sent with
+    ``Expect: 100-continue`` is checked against max_request_size from its headers
+    alone, and continue_expected() tells the caller when to send the interim
+    ``100 Continue`` that lets the client start sending the body.
+    """
+
+    RECV_SIZE: int = 64 * 1024
+    MAX_HEADER_SIZE: int = 64 * 1024
+    DEFAULT_MAX_REQUEST_SIZE: int = 10 * 1024 * 1024
+    DEFAULT_SPOOL_THRESHOLD: int = 1024 * 1024
+
+    def __init__(
+        self,
+        max_request_size: int | None = settings.max_request_size,
+        spool_threshold: int | None = settings.request_spool_threshold,
+    ) -> None:
+        self.max_request_size: int = max_request_size or self.DEFAULT_MAX_REQUEST_SIZE
+        self.spool_threshold: int = spool_threshold or self.DEFAULT_SPOOL_THRESHOLD
+        self._buffer = bytearray()
+        self._start: int = 0
+        self._end: int = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._state: int = _HEADERS
+        self._scan_from: int = self._start
+        self._request: Request | None = None
+        self._body = bytearray()
+        self._spool: tempfile.SpooledTemporaryFile | None = None
+        self._body_size: int = 0
+        self._remaining: int = 0
+        self._expects_continue: bool = False
+
+    @property
+    def buffered(self) -> int:
+        """Number of received bytes not yet consumed by a parsed request."""
+        return self._end - self._start
+
+    @property
+    def in_progress(self) -> bool:
+        """Whether part of a request has been received but not completed."""
+        return self._state != _HEADERS or self._end > self._start
+
+    def continue_expected(self) -> bool:
+        """
+        Whether to send ``100 Continue`` now; True at most once per request.
+
+        Returns:
+            bool: True if the request being received asked for 100-continue, was
+                not rejected, and its body has not started arriving yet.
+        """
+        if not self._expects_continue:
+            return False
+        self._expects_continue = False
+        return self._state != _HEADERS and self._end == self._start
+
+    def release(self) -> None:
+        """Free the receive buffer if no request is in progress or buffered."""
+        if not self.in_progress:
+            self._buffer = bytearray()
+            self._start = self._end = self._scan_from = 0
+
+    def recv_from(self, connection: socket.socket) -> int:
+        """
+        Receive directly into the parser's buffer.
+
+        Args:
+            connection (socket.socket): Socket to read from.
+
+        Returns:
+            int: Number of bytes received, 0 when the peer closed the connection.
+        """
+        self._reserve(self.RECV_SIZE)
+        with memoryview(self._buffer) as view:
+            received = connection.recv_into(view[self._end :])
+        self._end += received
+        return received
+
+    def feed(self, data: bytes) -> None:
+        """Append bytes received by other means, e.g. from an asyncio stream."""
+        self._reserve(len(data))
+        self._buffer[self._end : self._end + len(data)] = data
+        self._end += len(data)
+
+    def next_request(self) -> Request | None:
+        """
+        Parse the next complete request from the buffered bytes.
+
+        Returns:
+            Request | None: The request, or None if more bytes are needed.
+
+        Raises:
+            ParseError: If the request is malformed or exceeds the size limits.
+        """
+        if self._state == _HEADERS and not self._parse_head():
+            return None
+
+        if self._state == _BODY:
+            self._consume_body()
+            if self._remaining:
+                return None
+        elif not self._parse_chunked():
+            return None
+
+        request = self._request
+        assert request is not None
+        if self._spool is not None:
+            self._spool.seek(0)
+            request.attach_body(self._spool)
+        elif self._body:
+            request.attach_body(bytes(self._body))
+        self._reset()
+        return request
+
+    def _reserve(self, size: int) -> None:
+        if len(self._buffer) - self._end >= size:
+            return
+        if self._start:
+            pending = self._end - self._start
+            self._buffer[:pending] = self._buffer[self._start : self._end]
+            self._scan_from -= self._start
+            self._start, self._end = 0, pending
+        if len(self._buffer) - self._end < size:
+            self._buffer.extend(bytes(max(size, len(self._buffer))))
+
+    def _parse_head(self) -> bool:
+        scan_from = max(self._scan_from, self._start)
+        end = self._buffer.find(b"\r\n\r\n", scan_from, self._end)
+        if end == -1:
+            if self._end - self._start > self.MAX_HEADER_SIZE:
+                raise HeadersTooLargeError("Request headers too large")
+            self._scan_from = max(self._start, self._end - 3)
+            return False
+        if end - self._start > self.MAX_HEADER_SIZE:
+            raise HeadersTooLargeError("Request headers too large")
+
+        head = bytes(self._buffer[self._start : end])
+        self._start = end + 4
+        line_end = head.find(b"\r\n")
+        if line_end == -1:
+            line_end = len(head)
+
+        request_line_parts = head[:line_end].split(b" ")
+        if len(request_line_parts) != 3:
+            raise ParseError("Invalid request line format")
+        method_name, target, version = (
+            part.decode("latin-1") for part in request_line_parts
+        )
+        try:
+            method = HttpMethod(method_name)
+        except ValueError as e:
+            raise UnsupportedMethodError(f"Unsupported method: {method_name}") from e
+
+        # Only the framing headers are looked up here; the rest stay unparsed
+        # until a handler asks for them.
+        headers = Headers.from_raw(head[line_end:])
+        content_length = 0
+        length_header = headers.get("Content-Length")
+        if length_header is not None:
+            # isdigit() alone accepts Unicode digits that int() rejects.
+            if not (length_header.isascii() and length_header.isdigit()):
+                raise ParseError("Invalid Content-Length header")
+            content_length = int(length_header)
+        transfer_encoding = headers.get("Transfer-Encoding")
+        chunked = transfer_encoding is not None and (
+            transfer_encoding.lower().endswith("chunked")
+        )
+
+        if not chunked and content_length > self.max_request_size:
+            raise RequestTooLargeError("Request body exceeds the maximum size")
+        expect = headers.get("Expect")
+        if expect is not None and expect.lower() == "100-continue":
+            self._expects_continue = chunked or content_length > 0
+
+        self._request = Request(
+            method=method, version=version, path=target, headers=headers
+        )
+        self._state = _CHUNK_SIZE if chunked else _BODY
+        self._remaining = 0 if chunked else content_length
+        return True
+
+    def _consume_body(self) -> None:
+        size = min(self._remaining, self._end - self._start)
+        if not size:
+            return
+        if self._spool is None and self._body_size + size > self.spool_threshold:
+            self._spool = tempfile.SpooledTemporaryFile(max_size=self.spool_threshold)
+            self._spool.write(self._body)
+            self._body = bytearray()
+        with memoryview(self._buffer) as view:
+            chunk = view[self._start : self._start + size]
+            if self._spool is not None:
+                self._spool.write(chunk)
+            else:
+                self._body += chunk
+        self._start += size
+        self._remaining -= size
+        self._body_size += size
+
+    def _parse_chunked(self) -> bool:
+        while True:
+            if self._state == _CHUNK_DATA:
+                self._consume_body()
+                if self._remaining:
+                    return False
+                self._state = _CHUNK_END
+
+            if self._state == _CHUNK_END:
+                if self._end - self._start < 2:
+                    return False
+                if self._buffer[self._start : self._start + 2] != b"\r\n":
+                    raise ParseError("Invalid chunk terminator")
+                self._start += 2
+                self._state = _CHUNK_SIZE
+                continue
+
+            line_end = self._buffer.find(b"\r\n", self._start, self._end)
+            if line_end == -1:
+                if self._end - self._start > self.MAX_HEADER_SIZE:
+                    raise HeadersTooLargeError("Chunk header too large")
+                return False
+            line = bytes(self._buffer[self._start : line_end])
+            self._start = line_end + 2
+
+            if self._state == _TRAILERS:
+                if not line:
+                    return True
+                continue
+
+            try:
+                size = int(line.split(b";", 1)[0].strip(), 16)
+            except ValueError as e:
+                raise ParseError("Invalid chunk size") from e
+            if size == 0:
+                self._state = _TRAILERS
+                continue
+            if self._body_size + size > self.max_request_size:
+                raise RequestTooLargeError("Request body exceeds the maximum size")
+            self._remaining = size
+            self._state = _CHUNK_DATA
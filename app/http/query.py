@@ -0,0 +1,53 @@
+from typing import Iterator, Mapping
+from urllib.parse import parse_qsl
+
+
+class QueryParams(Mapping[str, str]):
+    """
+    Multi-dict of query string parameters, parsed on first use.
+
+    The query string is kept as received until a parameter is read. A name may
+    appear several times: query[name] returns its first value and getall(name)
+    every value in order. Parameters without a value, as in ``?debug``, map to
+    an empty string.
+    """
+
+    __slots__ = ("_query_string", "_store")
+
+    def __init__(self, query_string: str = "") -> None:
+        self._query_string: str = query_string
+        self._store: dict[str, list[str]] | None = None if query_string else {}
+
+    def __getitem__(self, key: str) -> str:
+        return self._parsed()[key][0]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._parsed()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parsed())
+
+    def __len__(self) -> int:
+        return len(self._parsed())
+
+    def __repr__(self) -> str:
+        return f"QueryParams({list(self.multi_items())!r})"
+
+    def getall(self, key: str) -> list[str]:
+        """Every value of a parameter in the order given, or [] if absent."""
+        return list(self._parsed().get(key, ()))
+
+    def multi_items(self) -> Iterator[tuple[str, str]]:
+        """Every (name, value) pair, repeated names included."""
+        for key, values in self._parsed().items():
+            for value in values:
+                yield key, value
+
+    def _parsed(self) -> dict[str, list[str]]:
+        store = self._store
+        if store is None:
+            store = {}
+            for key, value in parse_qsl(self._query_string, keep_blank_values=True):
+                store.setdefault(key, []).append(value)
+            self._store = store
+        return store
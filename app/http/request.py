@@ -1,23 +1,164 @@
+import io
+from collections import namedtuple
 from dataclasses import dataclass, field
-from typing import Any
+from functools import lru_cache
+from typing import IO, Any, MutableMapping
+from urllib.parse import unquote
 
+from app.http.headers import Headers
 from app.http.methods import HttpMethod
-from app.utils import format_headers, parse_headers
+from app.http.query import QueryParams
+from app.timing import PhaseTimer
+from app.utils import format_headers
 
+RequestBody = str | bytes | IO[bytes]
 
-@dataclass
+RouteParams = namedtuple("RouteParams", ["path_params", "query_params"])
+
+
+class InvalidRequestBodyError(ValueError):
+    """Raised when a request body read as text is not valid UTF-8."""
+
+
+@dataclass(slots=True)
 class RequestMetadata:
-    path_params: dict[str, str] = field(default_factory=dict)
+    path_params: dict[str, Any] = field(default_factory=dict)
+    route: str = field(default="")
+    timer: PhaseTimer | None = field(default=None)
 
 
-@dataclass
 class Request:
-    method: HttpMethod
-    version: str
-    path: str
-    headers: dict[str, str]
-    body: str = field(default="")
-    metadata: RequestMetadata = field(default_factory=lambda: RequestMetadata())
+    """An HTTP request.
+
+    The request target is split once into path and query_string. path is
+    normalized and percent-decoded (see normalize_path) and is what routing
+    matches on; target keeps the target as received. Query parameters are only
+    parsed when a handler first reads query.
+
+    Headers received from a client stay as raw bytes until a handler reads them
+    (see Headers), and the metadata is only created when first used, so a request
+    nobody inspects costs little more than its request line and body.
+
+    Received bodies are kept as bytes, or in a spooled temporary file once they
+    exceed the parser's spool threshold. stream reads either incrementally;
+    body_bytes and body load the whole body, the latter decoded as UTF-8.
+    """
+
+    __slots__ = (
+        "method",
+        "version",
+        "target",
+        "path",
+        "query_string",
+        "headers",
+        "_body",
+        "_query",
+        "_metadata",
+    )
+
+    def __init__(
+        self,
+        method: HttpMethod,
+        version: str,
+        path: str,
+        headers: MutableMapping[str, str],
+        body: RequestBody = "",
+        metadata: RequestMetadata | None = None,
+    ) -> None:
+        self.method: HttpMethod = method
+        self.version: str = version
+        self.target: str = path
+        raw_path, _, self.query_string = path.partition("?")
+        self.path: str = normalize_path(raw_path)
+        self.headers: MutableMapping[str, str] = (
+            headers if isinstance(headers, Headers) else Headers(headers)
+        )
+        self._body: RequestBody = body
+        self._query: QueryParams | None = None
+        self._metadata: RequestMetadata | None = metadata
+
+    def __repr__(self) -> str:
+        return (
+            f"Request(method={self.method!r}, version={self.version!r}, "
+            f"path={self.target!r}, headers={self.headers!r}, body={self._body!r})"
+        )
+
+    @property
+    def query(self) -> QueryParams:
+        """The query string parameters, parsed on first access."""
+        if self._query is None:
+            self._query = QueryParams(self.query_string)
+        return self._query
+
+    @property
+    def params(self) -> RouteParams:
+        """The path parameters captured by the route and the query parameters."""
+        return RouteParams(self.metadata.path_params, self.query)
+
+    @property
+    def body(self) -> str:
+        """
+        The whole body decoded as UTF-8, decoded again on every access.
+
+        Raises:
+            InvalidRequestBodyError: If the body is not valid UTF-8.
+        """
+        if isinstance(self._body, str):
+            return self._body
+        try:
+            return self.body_bytes.decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise InvalidRequestBodyError(
+                f"Request body is not valid UTF-8: {e}"
+            ) from e
+
+    @body.setter
+    def body(self, body: str) -> None:
+        self._body = body
+
+    def attach_body(self, body: RequestBody) -> None:
+        """Set the body as received: text, bytes, or a file it was spooled to."""
+        self._body = body
+
+    @property
+    def body_bytes(self) -> bytes:
+        """The whole body as bytes, read from disk if it was spooled there."""
+        body = self._body
+        if isinstance(body, bytes):
+            return body
+        if isinstance(body, str):
+            return body.encode("utf-8")
+        body.seek(0)
+        return body.read()
+
+    @property
+    def stream(self) -> IO[bytes]:
+        """A binary file object positioned at the start of the body."""
+        body = self._body
+        if isinstance(body, (bytes, str)):
+            return io.BytesIO(body if isinstance(body, bytes) else body.encode())
+        body.seek(0)
+        return body
+
+    @property
+    def metadata(self) -> RequestMetadata:
+        if self._metadata is None:
+            self._metadata = RequestMetadata()
+        return self._metadata
+
+    @property
+    def keep_alive(self) -> bool:
+        """
+        Whether the client asked for the connection to stay open.
+
+        HTTP/1.1 connections are persistent unless the Connection header lists
+        "close"; HTTP/1.0 connections close unless it lists "keep-alive".
+        """
+        connection = (self.headers.get("Connection") or "").lower()
+        if self.version == "HTTP/1.1":
+            # The substring test skips the split for the common header values.
+            return "close" not in connection or "close" not in _split_tokens(connection)
+        return "keep-alive" in connection and "keep-alive" in _split_tokens(connection)
 
     @classmethod
     def deserialize(cls, request_str: str) -> "Request":
@@ -41,16 +182,86 @@ class Request:
 
     def serialize(self) -> str:
         headers = format_headers(self.headers)
-        return f"{self.method} {self.path} {self.version}\r\n{headers}\r\n{self.body}"
+        return f"{self.method} {self.target} {self.version}\r\n{headers}\r\n{self.body}"
 
     @staticmethod
-    def _parse_request(request_str: str) -> tuple[str, dict[str, str], str]:
+    def _parse_request(
+        request_str: str,
+    ) -> tuple[str, MutableMapping[str, str], str]:
         parts = request_str.split("\r\n\r\n", 1)
         headers_section = parts[0]
         body = parts[1] if len(parts) > 1 else ""
 
-        lines = headers_section.split("\r\n")
-        request_line = lines[0]
-        headers = parse_headers(lines[1:])
+        request_line, _, _ = headers_section.partition("\r\n")
+        raw_headers = headers_section[len(request_line) :].encode("latin-1", "replace")
+        headers = Headers.from_raw(raw_headers)
 
         return request_line, headers, body
+
+
+def split_target(target: str) -> tuple[str, str]:
+    """Split a request target into its path, normalized, and its query string."""
+    path, _, query_string = target.partition("?")
+    return normalize_path(path), query_string
+
+
+def normalize_path(raw_path: str) -> str:
+    """
+    Resolve a request path's dot segments, then percent-decode each segment.
+
+    Empty and "." segments are dropped and ".." removes the segment before it,
+    never climbing above the root; a trailing slash is kept. Dot segments are
+    resolved before decoding, so an encoded "%2E%2E" is an ordinary segment, and
+    decoding never changes where segments start and end: a decoded segment keeps
+    "/" and "%" escaped as "%2F" and "%25", and one that decodes to "." or ".."
+    stays encoded. "/echo/a%2Fb" therefore has two segments, the second of which
+    the router passes to handlers decoded as "a/b". Results for short paths
+    that need rewriting are cached, since clients keep requesting the same few.
+    Targets that are not absolute paths, such as "*", are returned unchanged.
+
+    Args:
+        raw_path (str): The path part of the request target, as received.
+
+    Returns:
+        str: The normalized path.
+    """
+    if not raw_path.startswith("/"):
+        return raw_path
+    if "%" not in raw_path and "//" not in raw_path and "/." not in raw_path:
+        return raw_path
+    if len(raw_path) > _MAX_CACHED_PATH:
+        return _resolve_path(raw_path)
+    return _resolve_path_cached(raw_path)
+
+
+def _resolve_path(raw_path: str) -> str:
+    segments: list[str] = []
+    for segment in raw_path.split("/"):
+        if segment == "..":
+            if segments:
+                segments.pop()
+        elif segment and segment != ".":
+            segments.append(_decode_segment(segment))
+    normalized = "/" + "/".join(segments)
+    if segments and raw_path.endswith(("/", "/.", "/..")):
+        normalized += "/"
+    return normalized
+
+
+# Only short paths are cached, so the entries' total size stays bounded however
+# long the paths clients send are.
+_MAX_CACHED_PATH = 256
+_resolve_path_cached = lru_cache(maxsize=4096)(_resolve_path)
+
+
+def _decode_segment(segment: str) -> str:
+    if "%" not in segment:
+        return segment
+    decoded = unquote(segment)
+    if decoded in (".", ".."):
+        return "%2E" * len(decoded)
+    return decoded.replace("%", "%25").replace("/", "%2F")
+
+
+def _split_tokens(header_value: str) -> list[str]:
+    return [token.strip() for token in header_value.split(",")]
@@ -1,22 +1,268 @@
 from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import BinaryIO, Iterable, Iterator, Protocol, runtime_checkable
 
 from app.http.status import Status
-from app.utils import format_headers
+
+
+@dataclass
+class FileRange:
+    """A byte range of an open file, sent with sendfile instead of being read."""
+
+    file: BinaryIO
+    offset: int
+    count: int
+
+
+@runtime_checkable
+class _Readable(Protocol):
+    """A binary file object, such as an open file or a spooled temporary file."""
+
+    def read(self, size: int = -1, /) -> bytes:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+ResponseBody = str | bytes | FileRange | Iterable[bytes | str] | BinaryIO
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
 default_headers = {
     "Content-Type": "text/plain",
 }
 
+# Responses that never carry a body, and so are sent without framing headers.
+_BODILESS_STATUSES = frozenset(
+    status for status in Status if status.code < 200 or status.code in (204, 304)
+)
+
+_STATUS_LINES: dict[tuple[str, Status], bytes] = {
+    (version, status): f"{version} {status}\r\n".encode()
+    for version in ("HTTP/1.1", "HTTP/1.0")
+    for status in Status
+}
+
+
+@lru_cache(maxsize=1024)
+def _encode_header(key: str, value: str) -> bytes:
+    return f"{key}: {value}\r\n".encode()
+
+
+# Warm the cache with the headers nearly every response carries.
+for _key, _value in default_headers.items():
+    _encode_header(_key, _value)
+for _value in ("keep-alive", "close"):
+    _encode_header("Connection", _value)
+
+
+def _iter_chunks(body: ResponseBody) -> Iterator[bytes]:
+    if isinstance(body, FileRange):
+        try:
+            body.file.seek(body.offset)
+            remaining = body.count
+            while remaining and (
+                chunk := body.file.read(min(remaining, STREAM_CHUNK_SIZE))
+            ):
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            body.file.close()
+        return
+
+    if isinstance(body, _Readable):
+        try:
+            while chunk := body.read(STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            body.close()
+        return
+
+    if isinstance(body, (str, bytes)):
+        if body:
+            yield body.encode() if isinstance(body, str) else body
+        return
+
+    for item in body:
+        yield item.encode() if isinstance(item, str) else item
+
 
-@dataclass
 class Response:
-    version: str = field(default="HTTP/1.1")
-    status: Status = field(default=Status.OK)
-    headers: dict = field(default_factory=lambda: default_headers.copy())
-    body: str | bytes = field(default="")
+    """An HTTP response.
+
+    Responses created without headers share default_headers until their headers
+    are first accessed, when they get a private copy, and serialization writes the
+    framing headers straight into the head instead of storing them; a response
+    that nothing inspects never allocates a header dict of its own.
+
+    A response to a HEAD request has its body dropped by omit_body() and is
+    serialized as the head alone.
+    """
+
+    __slots__ = ("version", "status", "_headers", "body", "_body_omitted")
+
+    def __init__(
+        self,
+        version: str = "HTTP/1.1",
+        status: Status = Status.OK,
+        headers: dict | None = None,
+        body: ResponseBody = "",
+    ) -> None:
+        self.version: str = version
+        self.status: Status = status
+        self._headers: dict | None = headers
+        self.body: ResponseBody = body
+        self._body_omitted: bool = False
+
+    def __repr__(self) -> str:
+        return (
+            f"Response(version={self.version!r}, status={self.status!r}, "
+            f"headers={self._header_view()!r}, body={self.body!r})"
+        )
+
+    @property
+    def headers(self) -> dict:
+        if self._headers is None:
+            self._headers = default_headers.copy()
+        return self._headers
+
+    @headers.setter
+    def headers(self, headers: dict) -> None:
+        self._headers = headers
+
+    @property
+    def is_streaming(self) -> bool:
+        """Whether the body is an iterator or file object rather than str/bytes."""
+        return not isinstance(self.body, (str, bytes))
+
+    @property
+    def is_bodiless(self) -> bool:
+        """Whether the status forbids a body: 1xx, 204 and 304."""
+        return self.status in _BODILESS_STATUSES
+
+    @property
+    def is_chunked(self) -> bool:
+        return self._header_view().get("Transfer-Encoding") == "chunked"
+
+    def omit_body(self) -> "Response":
+        """
+        Drop the body, keeping the headers a GET response would have carried.
+
+        A fixed body or file range is replaced by its Content-Length, without
+        being encoded or read, unless the status forbids a body; a streaming body
+        is closed unread, so only a Content-Length the handler set is kept.
+
+        Returns:
+            Response: This response, serialized from now on without a body.
+        """
+        body = self.body
+        length: int | None = None
+        if isinstance(body, bytes):
+            length = len(body)
+        elif isinstance(body, str):
+            length = len(body) if body.isascii() else len(body.encode())
+        elif isinstance(body, FileRange):
+            length = body.count
+            body.file.close()
+        elif hasattr(body, "close"):
+            body.close()
+        if length is not None and not self.is_bodiless:
+            self.headers["Content-Length"] = str(length)
+        self.body = b""
+        self._body_omitted = True
+        return self
 
     def serialize(self) -> bytes:
-        body_bytes = self.body if isinstance(self.body, bytes) else self.body.encode()
-        self.headers["Content-Length"] = len(body_bytes)
-        headers = format_headers(self.headers)
-        return f"{self.version} {self.status}\r\n{headers}\r\n\r\n".encode() + body_bytes  # type: ignore
+        parts = self.serialize_parts()
+        if self.is_streaming:
+            parts.extend(part for chunk in self.iter_body_parts() for part in chunk)
+        return b"".join(parts)
+
+    def serialize_parts(self, chunked: bool = True) -> list[bytes]:
+        """
+        Serialize the response as separate head and body buffers.
+
+        The status line and string headers are served from pre-encoded caches, and
+        a bytes body is returned as-is rather than concatenated onto the head, so
+        the caller can hand both buffers to a single vectored send without copying
+        the body.
+
+        Streaming bodies are not read here: only the head is returned and the body
+        follows from iter_body_parts(). Unless the handler set Content-Length, the
+        head announces Transfer-Encoding: chunked when chunked is True; otherwise
+        the body is delimited by closing the connection.
+
+        1xx, 204 and 304 responses have no body and get no Content-Length unless
+        the handler set one, e.g. the length a 304's GET would have sent.
+
+        Args:
+            chunked (bool): Whether the client accepts chunked transfer encoding,
+                i.e. spoke HTTP/1.1.
+
+        Returns:
+            list[bytes]: The encoded status line and headers, followed by the body
+                when it is fixed and not empty.
+        """
+        body_bytes = b""
+        content_length: int | None = None
+        # omit_body() already stored the length a GET would have announced.
+        no_body = self._body_omitted or self.status in _BODILESS_STATUSES
+        if no_body:
+            pass
+        elif isinstance(self.body, bytes):
+            body_bytes = self.body
+        elif isinstance(self.body, str):
+            body_bytes = self.body.encode()
+        elif isinstance(self.body, FileRange):
+            content_length = self.body.count
+        elif chunked and "Content-Length" not in self._header_view():
+            # iter_body_parts() frames the body by this header.
+            self.headers["Transfer-Encoding"] = "chunked"
+        if not self.is_streaming and not no_body:
+            content_length = len(body_bytes)
+
+        status_line = _STATUS_LINES.get((self.version, self.status))
+        if status_line is None:
+            status_line = f"{self.version} {self.status}\r\n".encode()
+
+        lines = [status_line]
+        for key, value in self._header_view().items():
+            if content_length is not None and key == "Content-Length":
+                continue
+            if isinstance(value, str):
+                lines.append(_encode_header(key, value))
+            else:
+                lines.append(f"{key}: {value}\r\n".encode())
+        if content_length is not None:
+            lines.append(b"Content-Length: %d\r\n" % content_length)
+        lines.append(b"\r\n")
+
+        head = b"".join(lines)
+        return [head, body_bytes] if body_bytes else [head]
+
+    def iter_body(self) -> Iterator[bytes]:
+        """Yield a streaming body as bytes, reading file objects in fixed blocks."""
+        return _iter_chunks(self.body)
+
+    def iter_body_parts(self) -> Iterator[list[bytes]]:
+        """
+        Yield the buffers for each chunk of a streaming body, framed for the wire.
+
+        With chunked transfer encoding each chunk is wrapped in its size line and
+        CRLF as separate buffers, so chunk payloads are never copied, and the
+        terminating zero-length chunk is yielded last.
+        """
+        if not self.is_chunked:
+            for chunk in self.iter_body():
+                yield [chunk]
+            return
+
+        for chunk in self.iter_body():
+            if chunk:
+                yield [b"%x\r\n" % len(chunk), chunk, b"\r\n"]
+        yield [b"0\r\n\r\n"]
+
+    def _header_view(self) -> dict:
+        # Read-only access that leaves the shared defaults uncopied.
+        return default_headers if self._headers is None else self._headers
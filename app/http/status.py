@@ -2,6 +2,8 @@ from enum import StrEnum
 
 
 class Status(StrEnum):
+    CONTINUE = "100 Continue"
+
     OK = "200 OK"
     CREATED = "201 Created"
     ACCEPTED = "202 Accepted"
@@ -10,11 +12,22 @@ class Status(StrEnum):
     MULTIPLE_CHOICES = "300 Multiple Choices"
     MOVED_PERMANENTLY = "301 Moved Permanently"
     FOUND = "302 Found"
+    NOT_MODIFIED = "304 Not Modified"
 
     NOT_FOUND = "404 Not Found"
     BAD_REQUEST = "400 Bad Request"
     FORBIDDEN = "403 Forbidden"
     METHOD_NOT_ALLOWED = "405 Method Not Allowed"
+    REQUEST_TIMEOUT = "408 Request Timeout"
+    PAYLOAD_TOO_LARGE = "413 Payload Too Large"
+    RANGE_NOT_SATISFIABLE = "416 Range Not Satisfiable"
+    TOO_MANY_REQUESTS = "429 Too Many Requests"
+    REQUEST_HEADER_FIELDS_TOO_LARGE = "431 Request Header Fields Too Large"
 
     INTERNAL_SERVER_ERROR = "500 Internal Server Error"
     NOT_IMPLEMENTED = "501 Not Implemented"
+    SERVICE_UNAVAILABLE = "503 Service Unavailable"
+
+    @property
+    def code(self) -> int:
+        return int(self.value[:3])
@@ -0,0 +1,148 @@
+import errno
+import logging
+import os
+import socket
+import stat
+
+logger = logging.getLogger(__name__)
+
+# systemd passes inherited sockets starting at this descriptor (sd_listen_fds(3)).
+SD_LISTEN_FDS_START = 3
+
+
+def open_listener(
+    host: str,
+    port: int,
+    unix_socket: str | None = None,
+    unix_socket_mode: int = 0o660,
+    listen_fd: int | None = None,
+) -> socket.socket:
+    """
+    Open the socket a server accepts connections on.
+
+    An inherited listen_fd takes precedence over a Unix domain socket path, which
+    takes precedence over TCP on host and port.
+
+    Args:
+        host (str): Address to bind for TCP.
+        port (int): Port to bind for TCP.
+        unix_socket (str | None): Path of a Unix domain socket to listen on.
+        unix_socket_mode (int): Permission bits for the Unix domain socket file.
+        listen_fd (int | None): An already listening socket to adopt.
+
+    Returns:
+        socket.socket: The listening socket.
+    """
+    if listen_fd is not None:
+        return adopt_fd(listen_fd)
+    if unix_socket is not None:
+        return bind_unix(unix_socket, unix_socket_mode)
+    return bind_tcp(host, port)
+
+
+def bind_tcp(host: str, port: int) -> socket.socket:
+    """Create a TCP listener bound with SO_REUSEPORT to the host and port."""
+    return socket.create_server((host, port), backlog=socket.SOMAXCONN, reuse_port=True)
+
+
+def bind_unix(path: str, mode: int) -> socket.socket:
+    """
+    Create a listener on a Unix domain socket.
+
+    A socket file left behind by a server that is no longer running is replaced;
+    one that still accepts connections is not.
+
+    Args:
+        path (str): Filesystem path of the socket.
+        mode (int): Permission bits given to the socket file, such as 0o660.
+
+    Returns:
+        socket.socket: The listening socket.
+
+    Raises:
+        OSError: If the path is in use by a live server or is not a socket.
+    """
+    _remove_stale_socket(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(path)
+        # Applied before listen(), so no client can connect with the default mode.
+        os.chmod(path, mode)
+        sock.listen(socket.SOMAXCONN)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def adopt_fd(fd: int) -> socket.socket:
+    """
+    Wrap an already listening socket inherited from a supervisor.
+
+    Args:
+        fd (int): The inherited file descriptor.
+
+    Returns:
+        socket.socket: The listening socket, of whatever family it was bound with.
+
+    Raises:
+        ValueError: If the descriptor is not a listening stream socket.
+    """
+    sock = socket.socket(fileno=fd)
+    if sock.type != socket.SOCK_STREAM or not sock.getsockopt(
+        socket.SOL_SOCKET, socket.SO_ACCEPTCONN
+    ):
+        sock.detach()
+        raise ValueError(f"File descriptor {fd} is not a listening stream socket")
+    # Supervisors may hand over non-blocking sockets; the accept loop blocks.
+    sock.setblocking(True)
+    return sock
+
+
+def systemd_listen_fd() -> int | None:
+    """
+    Return the first socket passed with systemd socket activation, if any.
+
+    The LISTEN_PID and LISTEN_FDS variables are only honored when addressed to
+    this process, so they are ignored by children that inherit the environment.
+    """
+    try:
+        listen_pid = int(os.environ.get("LISTEN_PID", ""))
+        listen_fds = int(os.environ.get("LISTEN_FDS", ""))
+    except ValueError:
+        return None
+    if listen_pid != os.getpid() or listen_fds < 1:
+        return None
+    if listen_fds > 1:
+        logger.warning(f"Received {listen_fds} sockets, serving the first only")
+    return SD_LISTEN_FDS_START
+
+
+def listener_url(sock: socket.socket) -> str:
+    """Describe where a listening socket accepts connections, for logging."""
+    if sock.family == socket.AF_UNIX:
+        return f"unix:{sock.getsockname()}"
+    host, port = sock.getsockname()[:2]
+    if sock.family == socket.AF_INET6:
+        host = f"[{host}]"
+    return f"http://{host}:{port}"
+
+
+def _remove_stale_socket(path: str) -> None:
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise OSError(errno.EEXIST, f"{path} exists and is not a socket")
+    except FileNotFoundError:
+        return
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    except FileNotFoundError:
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, f"{path} is in use by a running server")
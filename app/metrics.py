@@ -0,0 +1,247 @@
+import bisect
+import threading
+from typing import Callable
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsShard:
+    """Counters written by a single thread.
+
+    Each thread records into its own shard without locking; shards are only read,
+    and merged, when the metrics are scraped.
+    """
+
+    __slots__ = (
+        "buckets",
+        "requests",
+        "latency_counts",
+        "latency_sums",
+        "bytes_received",
+        "bytes_sent",
+        "connections_opened",
+        "connections_closed",
+        "compression_input",
+        "compression_output",
+    )
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets: tuple[float, ...] = buckets
+        self.requests: dict[tuple[str, str, int], int] = {}
+        self.latency_counts: dict[tuple[str, str], list[int]] = {}
+        self.latency_sums: dict[tuple[str, str], float] = {}
+        self.bytes_received: int = 0
+        self.bytes_sent: int = 0
+        self.connections_opened: int = 0
+        self.connections_closed: int = 0
+        self.compression_input: int = 0
+        self.compression_output: int = 0
+
+    def observe_request(
+        self, route: str, method: str, status: int, duration: float
+    ) -> None:
+        """
+        Count a served request and add its latency to the route's histogram.
+
+        Args:
+            route (str): The matched route pattern, not the concrete path, so label
+                cardinality stays bounded.
+            method (str): The request method.
+            status (int): The response status code.
+            duration (float): Time spent serving the request, in seconds.
+        """
+        key = (route, method, status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+
+        latency_key = (route, method)
+        counts = self.latency_counts.get(latency_key)
+        if counts is None:
+            counts = self.latency_counts[latency_key] = [0] * (len(self.buckets) + 1)
+        counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.latency_sums[latency_key] = (
+            self.latency_sums.get(latency_key, 0.0) + duration
+        )
+
+    def observe_compression(self, input_size: int, output_size: int) -> None:
+        self.compression_input += input_size
+        self.compression_output += output_size
+
+
+class Metrics:
+    """Registry of server metrics, rendered in the Prometheus text format.
+
+    Counters live in per-thread shards (see shard()), so recording is a few dict
+    and integer updates with no lock. Gauges such as the worker queue depth are
+    callbacks evaluated at scrape time.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets: tuple[float, ...] = buckets
+        self._local = threading.local()
+        self._shards: list[MetricsShard] = []
+        self._gauges: dict[str, tuple[str, Callable[[], float]]] = {}
+        self._lock = threading.Lock()
+
+    def shard(self) -> MetricsShard:
+        """Return the calling thread's shard, creating it on first use."""
+        try:
+            local_shard: MetricsShard = self._local.shard
+            return local_shard
+        except AttributeError:
+            shard = MetricsShard(self.buckets)
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def register_gauge(
+        self, name: str, description: str, callback: Callable[[], float]
+    ) -> None:
+        """
+        Expose a value computed at scrape time, replacing any gauge of that name.
+
+        Args:
+            name (str): Prometheus metric name.
+            description (str): HELP text.
+            callback (Callable[[], float]): Returns the current value; must be
+                safe to call from any thread.
+        """
+        with self._lock:
+            self._gauges[name] = (description, callback)
+
+    def render(self) -> str:
+        """Merge every shard and render all metrics in the Prometheus text format."""
+        with self._lock:
+            shards = list(self._shards)
+            gauges = list(self._gauges.items())
+
+        requests: dict[tuple[str, str, int], int] = {}
+        latency_counts: dict[tuple[str, str], list[int]] = {}
+        latency_sums: dict[tuple[str, str], float] = {}
+        totals = dict.fromkeys(
+            (
+                "bytes_received",
+                "bytes_sent",
+                "connections_opened",
+                "connections_closed",
+                "compression_input",
+                "compression_output",
+            ),
+            0,
+        )
+        for shard in shards:
+            # Copies are taken under the GIL, so a concurrent writer adding a key
+            # cannot break the iteration.
+            for request_key, value in shard.requests.copy().items():
+                requests[request_key] = requests.get(request_key, 0) + value
+            for latency_key, counts in shard.latency_counts.copy().items():
+                merged = latency_counts.setdefault(latency_key, [0] * len(counts))
+                for index, count in enumerate(counts):
+                    merged[index] += count
+            for latency_key, total in shard.latency_sums.copy().items():
+                latency_sums[latency_key] = latency_sums.get(latency_key, 0.0) + total
+            for name in totals:
+                totals[name] += getattr(shard, name)
+
+        lines: list[str] = []
+        _header(lines, "http_requests_total", "counter", "Requests served.")
+        for (route, method, status), value in sorted(requests.items()):
+            labels = _labels(route=route, method=method, status=str(status))
+            lines.append(f"http_requests_total{{{labels}}} {value}")
+
+        _header(
+            lines,
+            "http_request_duration_seconds",
+            "histogram",
+            "Time spent serving requests.",
+        )
+        for (route, method), counts in sorted(latency_counts.items()):
+            labels = _labels(route=route, method=method)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{le}"}} '
+                    f"{cumulative}"
+                )
+            total = latency_sums.get((route, method), 0.0)
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {total}")
+            lines.append(
+                f"http_request_duration_seconds_count{{{labels}}} {cumulative}"
+            )
+
+        for name, description, value in (
+            (
+                "http_received_bytes_total",
+                "Request bytes received.",
+                totals["bytes_received"],
+            ),
+            ("http_sent_bytes_total", "Response bytes sent.", totals["bytes_sent"]),
+            (
+                "http_compression_input_bytes_total",
+                "Response body bytes before compression.",
+                totals["compression_input"],
+            ),
+            (
+                "http_compression_output_bytes_total",
+                "Response body bytes after compression.",
+                totals["compression_output"],
+            ),
+        ):
+            _header(lines, name, "counter", description)
+            lines.append(f"{name} {value}")
+
+        ratio = 0.0
+        if totals["compression_input"]:
+            ratio = totals["compression_output"] / totals["compression_input"]
+        _header(
+            lines,
+            "http_compression_ratio",
+            "gauge",
+            "Compressed size as a fraction of the original size.",
+        )
+        lines.append(f"http_compression_ratio {ratio}")
+
+        _header(lines, "http_active_connections", "gauge", "Open client connections.")
+        active = totals["connections_opened"] - totals["connections_closed"]
+        lines.append(f"http_active_connections {max(0, active)}")
+
+        for name, (description, callback) in gauges:
+            _header(lines, name, "gauge", description)
+            lines.append(f"{name} {callback()}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _header(lines: list[str], name: str, kind: str, description: str) -> None:
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+default_metrics = Metrics()
@@ -0,0 +1,85 @@
+import json
+
+from app.handler import BaseHandler
+from app.http.request import Request
+from app.http.response import Response
+from app.http.status import Status
+from app.metrics import Metrics, default_metrics
+from app.timing import RequestProfiler
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsHandler(BaseHandler):
+    """Serves the server's metrics in the Prometheus text exposition format.
+
+    Register it like any other handler:
+
+        server.router.add_route("/metrics", MetricsHandler)
+
+    With prefork workers each process keeps its own metrics, so a scrape reports
+    the worker that accepted it.
+    """
+
+    def __init__(self, metrics: Metrics = default_metrics) -> None:
+        self.metrics: Metrics = metrics
+
+    def get(self, request: Request) -> Response:
+        return Response(
+            status=Status.OK,
+            headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+            body=self.metrics.render(),
+        )
+
+
+class ProfileHandler(BaseHandler):
+    """Reports and reconfigures a running RequestProfiler.
+
+    Bind it to the profiler given to the server:
+
+        profiler = RequestProfiler()
+        server = HttpServer(profiler=profiler)
+        server.router.add_route(
+            "/debug/profile", partial(ProfileHandler, profiler=profiler)
+        )
+
+    GET returns the aggregated cProfile report (``?sort=tottime&limit=20``), POST
+    takes a JSON body such as ``{"sample_rate": 0.01, "routes": ["/todos"]}`` to
+    change what is profiled, and DELETE discards the collected stats.
+    """
+
+    def __init__(self, profiler: RequestProfiler) -> None:
+        self.profiler: RequestProfiler = profiler
+
+    def get(self, request: Request) -> Response:
+        sort = request.query.get("sort", "cumulative")
+        try:
+            limit = int(request.query.get("limit", "40"))
+            report = self.profiler.dump(sort=sort, limit=limit)
+        except (KeyError, ValueError) as e:
+            return Response(status=Status.BAD_REQUEST, body=f"Invalid query: {e}")
+        return Response(status=Status.OK, body=report)
+
+    def post(self, request: Request) -> Response:
+        try:
+            options = json.loads(request.body or "{}")
+            if "sample_rate" in options:
+                self.profiler.sample_rate = float(options["sample_rate"])
+            if "routes" in options:
+                self.profiler.routes = set(options["routes"])
+        except (TypeError, ValueError) as e:
+            return Response(status=Status.BAD_REQUEST, body=f"Invalid options: {e}")
+        return Response(
+            status=Status.OK,
+            headers={"Content-Type": "application/json"},
+            body=json.dumps(
+                {
+                    "sample_rate": self.profiler.sample_rate,
+                    "routes": sorted(self.profiler.routes),
+                }
+            ),
+        )
+
+    def delete(self, request: Request) -> Response:
+        self.profiler.reset()
+        return Response(status=Status.NO_CONTENT)
@@ -0,0 +1,128 @@
+import logging
+import os
+import signal
+import threading
+import time
+from types import FrameType
+from typing import TYPE_CHECKING
+
+from app.listener import listener_url
+
+if TYPE_CHECKING:
+    from app.server import HttpServer
+
+logger = logging.getLogger(__name__)
+
+
+class PreforkSupervisor:
+    """Runs an HttpServer in several forked worker processes.
+
+    For TCP every worker binds its own SO_REUSEPORT listener so the kernel spreads
+    new connections across processes; a Unix domain socket or inherited listener
+    is shared by all workers instead. Each runs the normal accept loop with its
+    own GIL. The supervisor restarts workers that exit unexpectedly and forwards
+    SIGINT/SIGTERM to all of them on shutdown.
+    """
+
+    _SHUTDOWN_GRACE_PERIOD: int = 10
+    _MIN_WORKER_LIFETIME: float = 1.0
+    _RESTART_BACKOFF: float = 1.0
+
+    def __init__(self, server: "HttpServer", workers: int) -> None:
+        self.server = server
+        self.workers: int = workers
+        self.children: dict[int, float] = {}
+        self.running: bool = False
+
+    def run(self) -> None:
+        """
+        Fork the workers and supervise them until a shutdown signal arrives.
+
+        The supervisor's own TCP listener is closed before forking so the kernel
+        never routes connections to a process that does not accept them. A shared
+        listener stays open for the workers to inherit and is closed, removing
+        its socket file, once they have all exited.
+        """
+        listener = listener_url(self.server.socket)
+        if not self.server.shares_listener:
+            self.server.socket.close()
+        self.running = True
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        logger.info(
+            f"Supervisor {os.getpid()} starting {self.workers} workers on {listener}"
+        )
+        for _ in range(self.workers):
+            self._spawn()
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            started_at = self.children.pop(pid, None)
+            if started_at is None or not self.running:
+                continue
+
+            logger.warning(
+                f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, "
+                "restarting"
+            )
+            if time.monotonic() - started_at < self._MIN_WORKER_LIFETIME:
+                time.sleep(self._RESTART_BACKOFF)
+            if self.running:
+                self._spawn()
+
+        self.server.close_socket()
+        logger.info("Supervisor stopped")
+
+    def shutdown(self) -> None:
+        """Stop restarting workers and ask every worker to shut down gracefully."""
+        if not self.running:
+            return
+        self.running = False
+        logger.info("Stopping workers...")
+        self._signal_children(signal.SIGTERM)
+
+        killer = threading.Timer(
+            self._SHUTDOWN_GRACE_PERIOD, self._signal_children, args=(signal.SIGKILL,)
+        )
+        killer.daemon = True
+        killer.start()
+
+    def _handle_signal(self, signum: int, frame: FrameType | None) -> None:
+        self.shutdown()
+
+    def _signal_children(self, signum: int) -> None:
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return
+
+        exit_code = 0
+        try:
+            self._run_worker()
+        except BaseException as e:
+            logger.error(f"Worker {os.getpid()} crashed: {e}")
+            exit_code = 1
+        finally:
+            logging.shutdown()
+            os._exit(exit_code)
+
+    def _run_worker(self) -> None:
+        # Ctrl+C reaches the whole process group; only the supervisor reacts to it.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.server.shutdown())
+        if not self.server.shares_listener:
+            self.server.socket = self.server.create_socket()
+        logger.info(f"Worker {os.getpid()} started")
+        self.server.serve()
@@ -0,0 +1,159 @@
+import ipaddress
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from app.http.request import Request
+from app.http.response import Response
+from app.http.status import Status
+
+
+@dataclass
+class RateLimit:
+    """A token bucket: rate requests per second on average, in bursts of burst.
+
+    Attributes:
+        rate (float): Tokens added to the bucket per second.
+        burst (int): Bucket capacity, i.e. requests allowed back to back.
+        rejection (bytes): Pre-serialized 429 Too Many Requests reply, with a
+            Retry-After of the time one token takes to refill.
+    """
+
+    rate: float
+    burst: int
+    rejection: bytes = field(default=b"", init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rejection = Response(
+            status=Status.TOO_MANY_REQUESTS,
+            headers={
+                "Content-Type": "text/plain",
+                "Retry-After": str(max(1, math.ceil(1 / self.rate))),
+                "Connection": "close",
+            },
+            body="Rate limit exceeded, retry later",
+        ).serialize()
+
+
+class _BucketShard:
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # key -> [tokens, last refill time], least recently used first.
+        self.buckets: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+
+
+class RateLimiter:
+    """Per-client token-bucket rate limiting with a bounded bucket table.
+
+    Clients are identified by their address. A request whose peer is one of
+    trusted_proxies is instead identified by key_header, X-Forwarded-For by
+    default: the rightmost hop that is not itself a trusted proxy, since hops
+    to its left were supplied by the client and can be forged. Without
+    trusted_proxies the header is ignored.
+
+    Buckets live in a fixed number of shards, each an LRU dictionary behind its
+    own lock; once a shard holds its share of capacity buckets, the least
+    recently used one is evicted. Memory therefore stays bounded however many
+    clients there are, and a check costs a hash, one uncontended lock and O(1)
+    dictionary operations.
+
+    An evicted client starts again with a full bucket, so capacity should
+    comfortably exceed the number of clients active within a few refill periods.
+
+    Attributes:
+        default (RateLimit | None): Limit applied to every request before it is
+            routed; None leaves only per-route limits.
+        key_header (str | None): Header listing the hops a request was
+            forwarded through, read only from trusted proxies.
+        trusted_proxies (tuple[IPv4Network | IPv6Network, ...]): Networks whose
+            key_header is believed.
+        capacity (int): Maximum number of buckets kept across all shards.
+    """
+
+    def __init__(
+        self,
+        default: RateLimit | None = None,
+        key_header: str | None = "X-Forwarded-For",
+        trusted_proxies: Iterable[str] = (),
+        capacity: int = 100_000,
+        shards: int = 16,
+    ) -> None:
+        self.default: RateLimit | None = default
+        self.key_header: str | None = key_header
+        self.trusted_proxies: tuple[
+            ipaddress.IPv4Network | ipaddress.IPv6Network, ...
+        ] = tuple(
+            ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies
+        )
+        self.capacity: int = capacity
+        self._shard_capacity: int = max(1, capacity // shards)
+        self._shards: list[_BucketShard] = [_BucketShard() for _ in range(shards)]
+
+    def __len__(self) -> int:
+        return sum(len(shard.buckets) for shard in self._shards)
+
+    def client_key(self, address: tuple | str, request: Request) -> str:
+        """The identity a request is rate limited under."""
+        peer: str = address[0] if isinstance(address, tuple) else str(address)
+        if self.key_header is None or not self._is_trusted(peer):
+            return peer or "-"
+        value = request.headers.get(self.key_header)
+        if not value:
+            return peer
+        hops = [hop.strip() for hop in value.split(",")]
+        for hop in reversed(hops):
+            if hop and not self._is_trusted(hop):
+                return hop
+        # Every hop is a trusted proxy; the first one is where the request began.
+        return hops[0] or peer
+
+    def _is_trusted(self, host: str) -> bool:
+        if not self.trusted_proxies:
+            return False
+        try:
+            ip = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.trusted_proxies)
+
+    def allow(self, client: str, limit: RateLimit, scope: str = "") -> bool:
+        """
+        Take a token from a client's bucket for a limit.
+
+        Args:
+            client (str): The client key, see client_key().
+            limit (RateLimit): The limit to apply.
+            scope (str): Separates buckets of different limits for the same
+                client, e.g. the route pattern; "" for the default limit.
+
+        Returns:
+            bool: True if the request may proceed, False if it should be
+                answered with limit.rejection.
+        """
+        key = (scope, client)
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with shard.lock:
+            buckets = shard.buckets
+            bucket = buckets.get(key)
+            if bucket is None:
+                if len(buckets) >= self._shard_capacity:
+                    buckets.popitem(last=False)
+                buckets[key] = [limit.burst - 1.0, now]
+                return True
+
+            buckets.move_to_end(key)
+            tokens = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                return False
+            bucket[0] = tokens - 1.0
+            return True
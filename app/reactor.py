@@ -0,0 +1,199 @@
+import heapq
+import itertools
+import logging
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from app.server import HttpConnection
+
+logger = logging.getLogger(__name__)
+
+
+class _Parked:
+    """A parked connection, shared by its selector key and its deadline entry.
+
+    The connection is cleared when it leaves the reactor before its deadline, so
+    the entry left behind in the heap no longer keeps it or its parser alive.
+    """
+
+    __slots__ = ("connection",)
+
+    def __init__(self, connection: "HttpConnection") -> None:
+        self.connection: "HttpConnection" | None = connection
+
+
+class Reactor:
+    """Parks idle connections on a selector until they have a request to read.
+
+    A single thread waits on epoll (or the platform's best selector) for every
+    parked connection and hands a connection to dispatch as soon as it becomes
+    readable, so idle keep-alive clients hold a file descriptor rather than a
+    worker thread. Connections left idle for longer than idle_timeout are closed,
+    using a heap of deadlines so expiry costs O(log n) per connection. Entries
+    of connections dispatched before their deadline are dropped lazily, and the
+    heap is compacted once they make up most of it.
+
+    park() may be called from any thread; everything else runs on the reactor
+    thread.
+    """
+
+    _THREAD_TIMEOUT: int = 1
+    _COMPACT_MIN_STALE: int = 64
+
+    def __init__(
+        self,
+        dispatch: Callable[["HttpConnection"], None],
+        idle_timeout: float,
+    ) -> None:
+        self.dispatch = dispatch
+        self.idle_timeout: float = idle_timeout
+        self.running: bool = False
+        self._selector = selectors.DefaultSelector()
+        self._pending: deque["HttpConnection"] = deque()
+        self._deadlines: list[tuple[float, int, _Parked]] = []
+        self._stale: int = 0
+        self._sequence = itertools.count()
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+        self._wakeup_writer.setblocking(False)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def parked(self) -> int:
+        """Number of connections currently waiting on the selector."""
+        return max(0, len(self._selector.get_map()) - 1)
+
+    def start(self) -> None:
+        self.running = True
+        self._selector.register(self._wakeup_reader, selectors.EVENT_READ, None)
+        self._thread = threading.Thread(
+            target=self._run, name="http-reactor", daemon=True
+        )
+        self._thread.start()
+
+    def park(self, http_connection: "HttpConnection") -> None:
+        """
+        Wait for the connection's next request without holding a thread.
+
+        Args:
+            http_connection (HttpConnection): A connection with no request in
+                progress; it is closed if the reactor has stopped.
+        """
+        if not self.running:
+            http_connection.close()
+            return
+        self._pending.append(http_connection)
+        self._wake()
+
+    def stop(self) -> None:
+        """Stop the reactor thread and close every parked connection."""
+        self.running = False
+        self._wake()
+        if self._thread is not None:
+            self._thread.join(timeout=self._THREAD_TIMEOUT)
+
+    def _wake(self) -> None:
+        try:
+            self._wakeup_writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            # A full buffer already guarantees a pending wakeup.
+            pass
+
+    def _run(self) -> None:
+        try:
+            while self.running:
+                timeout = None
+                if self._deadlines:
+                    timeout = max(0.0, self._deadlines[0][0] - time.monotonic())
+                for key, _ in self._selector.select(timeout):
+                    if key.data is None:
+                        self._drain_wakeup()
+                        continue
+                    parked = key.data
+                    http_connection = parked.connection
+                    parked.connection = None
+                    self._stale += 1
+                    try:
+                        self._selector.unregister(key.fileobj)
+                        self.dispatch(http_connection)
+                    except Exception as e:
+                        # One failing connection must not stop the others.
+                        address = http_connection.address
+                        logger.error(f"Could not dispatch connection {address}: {e}")
+                        http_connection.close()
+                self._register_pending()
+                self._expire_idle()
+                self._compact()
+        except Exception as e:
+            logger.error(f"Reactor stopped unexpectedly: {e}")
+        finally:
+            # park() closes connections from now on instead of queueing them.
+            self.running = False
+            self._close_all()
+
+    def _drain_wakeup(self) -> None:
+        try:
+            while self._wakeup_reader.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _register_pending(self) -> None:
+        now = time.monotonic()
+        while self._pending:
+            http_connection = self._pending.popleft()
+            parked = _Parked(http_connection)
+            try:
+                self._selector.register(
+                    http_connection.connection, selectors.EVENT_READ, parked
+                )
+            except (KeyError, ValueError, OSError) as e:
+                address = http_connection.address
+                logger.debug(f"Could not park connection {address}: {e}")
+                http_connection.close()
+                continue
+            heapq.heappush(
+                self._deadlines,
+                (now + self.idle_timeout, next(self._sequence), parked),
+            )
+
+    def _expire_idle(self) -> None:
+        now = time.monotonic()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            parked = heapq.heappop(self._deadlines)[2]
+            http_connection = parked.connection
+            # Connections dispatched since they were parked left a stale entry.
+            if http_connection is None:
+                self._stale -= 1
+                continue
+            parked.connection = None
+            self._selector.unregister(http_connection.connection)
+            logger.debug(f"Idle connection from {http_connection.address} expired")
+            http_connection.close()
+
+    def _compact(self) -> None:
+        stale = self._stale
+        if stale < self._COMPACT_MIN_STALE or stale * 2 < len(self._deadlines):
+            return
+        self._deadlines = [
+            entry for entry in self._deadlines if entry[2].connection is not None
+        ]
+        heapq.heapify(self._deadlines)
+        self._stale = 0
+
+    def _close_all(self) -> None:
+        for key in list(self._selector.get_map().values()):
+            if key.data is not None and key.data.connection is not None:
+                key.data.connection.close()
+        while self._pending:
+            self._pending.popleft().close()
+        self._deadlines.clear()
+        self._stale = 0
+        self._selector.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
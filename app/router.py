@@ -1,60 +1,231 @@
 from dataclasses import dataclass, field
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
+from urllib.parse import unquote
 
+from app.admission import Priority
+from app.cache import ResponseCache, default_response_cache
 from app.handler import BaseHandler
+from app.ratelimit import RateLimit
 
 Routes = dict[str, Callable]
 
+# Typed params are tried before plain strings so "/items/{id:int}" wins over
+# "/items/{slug}" for numeric segments; catch-alls are tried last.
+_CONVERTER_PRIORITY: dict[str, int] = {"int": 0, "str": 1, "path": 2}
+
+
+@dataclass
+class RouteNode:
+    """A node of the compiled route trie, one level per path segment."""
+
+    static: dict[str, "RouteNode"] = field(default_factory=dict)
+    params: list["ParamEdge"] = field(default_factory=list)
+    handler: Optional[Callable] = None
+    pattern: str = field(default="")
+
+
+@dataclass
+class ParamEdge:
+    name: str
+    converter: str
+    node: RouteNode = field(default_factory=RouteNode)
+
 
 @dataclass
 class Router:
     name: str = field(default="")
     routes: Routes = field(default_factory=lambda: {"/": BaseHandler()})
 
-    def add_route(self, path: str, handler: Callable) -> None:
-        self.routes[path] = handler()
+    def __post_init__(self) -> None:
+        self._root = RouteNode()
+        self._static_routes: Routes = {}
+        self._priorities: dict[str, Priority] = {}
+        self._rate_limits: dict[str, RateLimit] = {}
+        for path, handler in self.routes.items():
+            self._compile(path, handler)
+
+    def add_route(
+        self,
+        path: str,
+        handler: Callable,
+        cache: bool | ResponseCache = False,
+        cache_ttl: float | None = None,
+        priority: Priority = Priority.NORMAL,
+        rate_limit: RateLimit | None = None,
+    ) -> None:
+        """
+        Register a handler class for a URL pattern.
+
+        Patterns are compiled into the route trie once, here. Segments written as
+        {name} capture a single path segment; {name:int} only matches ASCII digits
+        and passes an int; {name:path} must be last and captures the remainder of
+        the path, slashes included.
+
+        Args:
+            path (str): URL pattern, e.g. "/users/{id:int}/posts".
+            handler (Callable): Handler class, instantiated once at registration.
+            cache (bool | ResponseCache): Serve GET responses from a response
+                cache: True for the shared default cache, or a specific instance.
+            cache_ttl (float | None): Lifetime of cached responses, defaults to the
+                cache's TTL.
+            priority (Priority): How readily admission control sheds the route's
+                requests under load.
+            rate_limit (RateLimit | None): Per-client limit on the route's
+                requests, enforced when the server has a RateLimiter and counted
+                separately from its default limit.
+
+        Raises:
+            ValueError: If the pattern uses an unknown converter or a {name:path}
+                segment that is not last.
+        """
+        instance = handler()
+        if cache:
+            instance.response_cache = (
+                cache if isinstance(cache, ResponseCache) else default_response_cache
+            )
+            instance.response_cache_ttl = cache_ttl
+        self.routes[path] = instance
+        self._compile(path, instance)
+        if priority == Priority.NORMAL:
+            self._priorities.pop(path, None)
+        else:
+            self._priorities[path] = priority
+        if rate_limit is None:
+            self._rate_limits.pop(path, None)
+        else:
+            self._rate_limits[path] = rate_limit
 
     def route(self, path: str) -> Callable:
         return self.routes[path]
 
-    def match_route(self, path: str) -> tuple[Optional[Callable], dict]:
-        if path in self.routes:
-            return self.routes[path], {}
+    def priority(self, pattern: str) -> Priority:
+        """The admission priority of the route registered under pattern."""
+        return self._priorities.get(pattern, Priority.NORMAL)
 
-        for pattern, handler in self.routes.items():
-            path_params = self._match_pattern(pattern, path)
-            if path_params is not None:
-                return handler, path_params
+    def rate_limit(self, pattern: str) -> RateLimit | None:
+        """The rate limit of the route registered under pattern, if any."""
+        return self._rate_limits.get(pattern)
 
-        return None, {}
+    def match_route(self, path: str) -> tuple[Optional[Callable], dict]:
+        handler, params, _ = self.match(path)
+        return handler, params
 
-    def _match_pattern(self, pattern: str, path: str) -> dict | None:
+    def match(self, path: str) -> tuple[Optional[Callable], dict, str]:
         """
-        Match a URL pattern with path parameters against an actual path.
-
-        Matches patterns like "/users/{id}" against paths like "/users/123".
-        Path parameters are extracted from {param} placeholders in the pattern.
+        Resolve a request path to its handler.
 
         Args:
-            pattern (str): URL pattern containing optional {param} placeholders
-            path (str): Actual URL path to match against
+            path (str): The request path, already split from the query string
+                and normalized, as in Request.path. Captured parameters are
+                returned with the "%2F" and "%25" escapes it keeps decoded.
 
         Returns:
-            dict | None: Dictionary of extracted path parameters if pattern matches,
-                        None if pattern does not match
+            tuple[Optional[Callable], dict, str]: The handler, the captured path
+                parameters and the pattern the handler was registered under, or
+                (None, {}, "") if no route matches.
+        """
+        handler = self._static_routes.get(path)
+        if handler is not None:
+            return handler, {}, path
+
+        params: list[tuple[str, Any]] = []
+        node = self._lookup(self._root, path.split("/"), 0, params)
+        if node is None:
+            return None, {}, ""
+        return node.handler, dict(params), node.pattern
+
+    def _compile(self, pattern: str, handler: Callable) -> None:
+        node = self._root
+        segments = pattern.split("/")
+        for index, segment in enumerate(segments):
+            if not (segment.startswith("{") and segment.endswith("}")):
+                node = node.static.setdefault(segment, RouteNode())
+                continue
+
+            name, _, converter = segment[1:-1].partition(":")
+            converter = converter or "str"
+            if converter not in _CONVERTER_PRIORITY:
+                raise ValueError(f"Unknown path parameter converter: {converter}")
+            if converter == "path" and index != len(segments) - 1:
+                raise ValueError("{name:path} parameters must be the last segment")
+
+            edge = next(
+                (
+                    edge
+                    for edge in node.params
+                    if edge.name == name and edge.converter == converter
+                ),
+                None,
+            )
+            if edge is None:
+                edge = ParamEdge(name=name, converter=converter)
+                node.params.append(edge)
+                node.params.sort(key=lambda edge: _CONVERTER_PRIORITY[edge.converter])
+            node = edge.node
+
+        node.handler = handler
+        node.pattern = pattern
+        if "{" not in pattern:
+            self._static_routes[pattern] = handler
+        else:
+            self._static_routes.pop(pattern, None)
+
+    def _lookup(
+        self,
+        node: RouteNode,
+        segments: list[str],
+        index: int,
+        params: list[tuple[str, Any]],
+    ) -> RouteNode | None:
         """
-        pattern_parts = pattern.split("/")
-        path_parts = path.split("/")
+        Walk the route trie for the path segments starting at index.
 
-        if len(pattern_parts) != len(path_parts):
-            return None
+        Static children are tried before parameter children, backtracking to the
+        next candidate when a branch dead-ends, so lookup cost depends on the number
+        of path segments rather than the number of registered routes.
 
-        params = {}
-        for p_part, actual_part in zip(pattern_parts, path_parts):
-            if p_part.startswith("{") and p_part.endswith("}"):
-                param_name = p_part[1:-1]
-                params[param_name] = actual_part
-            elif p_part != actual_part:
-                return None
+        Args:
+            node (RouteNode): Trie node matched by the previous segment.
+            segments (list[str]): The request path split on "/".
+            index (int): Index of the next segment to match.
+            params (list[tuple[str, Any]]): Captured parameters, appended in place.
 
-        return params
+        Returns:
+            RouteNode | None: The node holding the matched handler, or None.
+        """
+        if index == len(segments):
+            return node if node.handler is not None else None
+
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            found = self._lookup(child, segments, index + 1, params)
+            if found is not None:
+                return found
+
+        for edge in node.params:
+            if edge.converter == "path":
+                if edge.node.handler is not None:
+                    params.append((edge.name, _decode("/".join(segments[index:]))))
+                    return edge.node
+                continue
+
+            if edge.converter == "int":
+                if not (segment.isascii() and segment.isdigit()):
+                    continue
+                value: Any = int(segment)
+            else:
+                value = _decode(segment)
+
+            params.append((edge.name, value))
+            found = self._lookup(edge.node, segments, index + 1, params)
+            if found is not None:
+                return found
+            params.pop()
+
+        return None
+
+
+def _decode(value: str) -> str:
+    # Request.path keeps "/" and "%" escaped inside segments; see normalize_path.
+    return unquote(value) if "%" in value else value
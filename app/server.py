@@ -1,164 +1,692 @@
 import logging
+import os
+import queue
+import select
 import socket
 import threading
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 
+from app.access_log import AccessLog
+from app.admission import AdmissionController, Priority
 from app.configs import settings
+from app.http.methods import HttpMethod
+from app.http.parser import ParseError, RequestParser
 from app.http.request import Request
-from app.http.response import Response
+from app.http.response import FileRange, Response
 from app.http.status import Status
+from app.listener import listener_url, open_listener, systemd_listen_fd
+from app.metrics import UNMATCHED_ROUTE, Metrics, default_metrics
+from app.prefork import PreforkSupervisor
+from app.ratelimit import RateLimiter
+from app.reactor import Reactor
 from app.router import Router
+from app.timing import Phase, PhaseTimer, RequestProfiler, RequestTiming
 
 logger = logging.getLogger(__name__)
 
+_SERVICE_UNAVAILABLE = Response(
+    status=Status.SERVICE_UNAVAILABLE,
+    headers={"Connection": "close", "Retry-After": "1"},
+).serialize()
+_REQUEST_TIMEOUT = Response(
+    status=Status.REQUEST_TIMEOUT, headers={"Connection": "close"}
+).serialize()
+CONTINUE = f"HTTP/1.1 {Status.CONTINUE}\r\n\r\n".encode()
+
+
+def drop_unsendable_body(request: Request, response: Response) -> None:
+    """
+    Close a streaming body that must not follow the head.
+
+    HEAD responses and 1xx, 204 and 304 responses end with their head, so any
+    bytes streamed after it would be read as the start of the next response on
+    the connection. Their iterator or file is closed unread instead.
+
+    Args:
+        request (Request): The request being answered.
+        response (Response): Its response; its body is dropped in place.
+    """
+    if response.is_streaming and (
+        response.is_bodiless or request.method == HttpMethod.HEAD
+    ):
+        response.omit_body()
+
+
+def set_keep_alive(
+    request: Request,
+    response: Response,
+    served: int,
+    max_requests: int,
+    timeout: int,
+) -> bool:
+    """
+    Decide whether a connection stays open after a response and label it.
+
+    HTTP/1.1 connections persist by default and HTTP/1.0 ones only when asked to.
+    A connection is closed after max_requests responses, when the handler set
+    Connection: close, or when an HTTP/1.0 streaming body can only be delimited by
+    closing. Kept-alive responses advertise the idle timeout and the remaining
+    request budget in a Keep-Alive header.
+
+    Args:
+        request (Request): The request being answered.
+        response (Response): Its response; Connection headers are set in place.
+        served (int): Requests served on the connection, this one included.
+        max_requests (int): Maximum requests served on one connection.
+        timeout (int): Seconds an idle connection is kept open.
+
+    Returns:
+        bool: Whether to keep the connection open.
+    """
+    keep_alive = (
+        request.keep_alive
+        and served < max_requests
+        and response.headers.get("Connection") != "close"
+    )
+    if response.is_streaming and request.version == "HTTP/1.0":
+        # Without chunked encoding the end of the body is the end of the
+        # connection, unless the handler supplied a Content-Length.
+        keep_alive = keep_alive and "Content-Length" in response.headers
+
+    if keep_alive:
+        response.headers["Connection"] = "keep-alive"
+        response.headers[
+            "Keep-Alive"
+        ] = f"timeout={timeout}, max={max_requests - served}"
+    else:
+        response.headers["Connection"] = "close"
+    return keep_alive
+
 
 @dataclass
 class HttpConnection:
     connection: socket.socket
     address: str
+    parser: RequestParser = field(default_factory=RequestParser)
+    served: int = 0
+    enqueued_at: float = 0.0
+    bytes_received: int = 0
+    bytes_sent: int = 0
+    metrics: Metrics | None = None
+    closed: bool = False
+
+    def recv(self) -> int:
+        """Receive into the connection's parser, returning the byte count."""
+        received = self.parser.recv_from(self.connection)
+        self.bytes_received += received
+        return received
 
     def send_response(self, response_bytes: bytes) -> None:
         self.connection.sendall(response_bytes)
+        self.bytes_sent += len(response_bytes)
+
+    def send_buffers(self, buffers: list[bytes]) -> None:
+        """Write the buffers in order with vectored sends, without joining them."""
+        if not buffers:
+            return
+        if len(buffers) == 1:
+            self.send_response(buffers[0])
+            return
+
+        views = [memoryview(buffer) for buffer in buffers]
+        while views:
+            sent = self.connection.sendmsg(views)
+            self.bytes_sent += sent
+            while sent and sent >= len(views[0]):
+                sent -= len(views.pop(0))
+            if sent:
+                views[0] = views[0][sent:]
+
+    def send_file(self, file_range: FileRange) -> None:
+        """Send a file range with sendfile, so its bytes never enter user space."""
+        try:
+            self.bytes_sent += self.connection.sendfile(
+                file_range.file, file_range.offset, file_range.count
+            )
+        finally:
+            file_range.file.close()
+
+    def wait_readable(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for the client to send more data."""
+        poller = select.poll()
+        poller.register(self.connection, select.POLLIN)
+        return bool(poller.poll(timeout * 1000))
 
-    def set_timeout(self, timeout: int) -> None:
+    def set_timeout(self, timeout: float) -> None:
         self.connection.settimeout(timeout)
 
     def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
         try:
             self.connection.close()
         except Exception:
             pass
+        if self.metrics is not None:
+            self.metrics.shard().connections_closed += 1
 
 
 class HttpServer:
-    _THREAD_CLEANUP_INTERVAL: int = 5
     _THREAD_TIMEOUT: int = 1
     _CONNECTION_TIMEOUT: int = 30
-
-    def __init__(self, host: str = settings.host, port: int = settings.port) -> None:
+    _MAX_PIPELINE: int = 32
+    _DEFAULT_MAX_CONNECTIONS: int = 64
+    _DEFAULT_MAX_KEEP_ALIVE_REQUESTS: int = 100
+    # Busy clients usually send their next request within a round trip; waiting
+    # this long for it saves two thread handoffs through the reactor.
+    _KEEP_ALIVE_LINGER: float = 0.002
+
+    def __init__(
+        self,
+        host: str = settings.host,
+        port: int = settings.port,
+        unix_socket: str | None = settings.unix_socket,
+        unix_socket_mode: int = settings.unix_socket_mode,
+        listen_fd: int | None = settings.listen_fd,
+        max_connections: int | None = settings.max_connections,
+        max_pending_connections: int | None = settings.max_pending_connections,
+        max_keep_alive_requests: int | None = settings.max_keep_alive_requests,
+        max_request_timeout: int | None = settings.max_request_timeout,
+        metrics: Metrics = default_metrics,
+        timing: RequestTiming | None = None,
+        profiler: RequestProfiler | None = None,
+        access_log: AccessLog | None = None,
+        admission: AdmissionController | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
         self.host: str = host
         self.port: int = port
-        self.socket = socket.create_server((self.host, self.port), reuse_port=True)
+        self.unix_socket: str | None = unix_socket
+        self.unix_socket_mode: int = unix_socket_mode
+        self.listen_fd: int | None = (
+            listen_fd if listen_fd is not None else systemd_listen_fd()
+        )
+        self._socket_owner: int | None = None
+        self.socket = self.create_socket()
         self.router = Router()
-        self.threads: list[threading.Thread] = []
+        self.max_connections: int = max_connections or self._DEFAULT_MAX_CONNECTIONS
+        self.connection_queue: queue.Queue[HttpConnection | None] = queue.Queue(
+            maxsize=max_pending_connections or self.max_connections
+        )
+        self.max_keep_alive_requests: int = (
+            max_keep_alive_requests or self._DEFAULT_MAX_KEEP_ALIVE_REQUESTS
+        )
+        self.request_timeout: int = max_request_timeout or self._CONNECTION_TIMEOUT
+        self.worker_threads: list[threading.Thread] = []
+        self.reactor: Reactor | None = None
+        self.metrics: Metrics = metrics
+        self.timing: RequestTiming | None = timing
+        self.profiler: RequestProfiler | None = profiler
+        self.access_log: AccessLog | None = access_log
+        self.admission: AdmissionController | None = admission
+        self.rate_limiter: RateLimiter | None = rate_limiter
         self.running: bool = False
 
-    def run(self) -> None:
+    @property
+    def shares_listener(self) -> bool:
+        """Whether forked workers must share one listener instead of each binding."""
+        return self.listen_fd is not None or self.unix_socket is not None
+
+    def create_socket(self) -> socket.socket:
+        """
+        Create the listening socket.
+
+        Adopts listen_fd when one was passed in or inherited through systemd socket
+        activation, otherwise listens on unix_socket when set, and otherwise binds
+        the host and port with SO_REUSEPORT.
+        """
+        sock = open_listener(
+            self.host,
+            self.port,
+            unix_socket=self.unix_socket,
+            unix_socket_mode=self.unix_socket_mode,
+            listen_fd=self.listen_fd,
+        )
+        if self.listen_fd is None and self.unix_socket is not None:
+            self._socket_owner = os.getpid()
+        return sock
+
+    def close_socket(self) -> None:
+        """Close the listener, removing a Unix domain socket file this process bound."""
+        try:
+            self.socket.close()
+        except Exception:
+            pass
+        if self._socket_owner == os.getpid() and self.unix_socket is not None:
+            self._socket_owner = None
+            try:
+                os.unlink(self.unix_socket)
+            except OSError:
+                pass
+
+    def run(self, workers: int | None = settings.workers) -> None:
         """
         Run the HTTP server.
 
-        Starts the server on the configured host and port, accepting incoming connections
-        and handling them in separate threads. Also starts a cleanup thread to remove
-        completed connection threads.
+        With workers greater than one, forks that many processes under a
+        PreforkSupervisor, each with its own accept loop, on its own SO_REUSEPORT
+        listener for TCP or on the shared Unix domain socket or inherited listener.
+        Zero starts one worker per CPU. Otherwise serves from this process.
+
+        Args:
+            workers (int | None): Number of worker processes to fork.
+        """
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        if workers is not None and workers > 1:
+            PreforkSupervisor(self, workers).run()
+            return
+        self.serve()
+
+    def serve(self) -> None:
+        """
+        Serve connections from this process.
+
+        Starts a fixed pool of max_connections worker threads and a reactor, then
+        accepts incoming connections on the listening socket. Connections
+        wait on the reactor until they are readable and are then handed to the
+        pool through a bounded queue, so idle keep-alive clients don't occupy
+        workers. When the queue is full the connection is answered with 503 Service
+        Unavailable and closed instead of waiting for a worker.
 
         The server runs until shutdown() is called or a KeyboardInterrupt is received.
-        Each connection is handled in its own thread with configurable timeouts.
         """
         self.running = True
-        cleanup_thread = threading.Thread(target=self._cleanup_threads, daemon=True)
-        cleanup_thread.start()
-        logger.info(f"Server started on http://{self.host}:{self.port}")
+        self._start_workers()
+        self.reactor = Reactor(self._enqueue_connection, self.request_timeout)
+        self.reactor.start()
+        if self.access_log is not None:
+            self.access_log.start()
+        self._register_gauges()
+        accept_metrics = self.metrics.shard()
+        logger.info(f"Server started on {listener_url(self.socket)}")
         logger.info("Press Ctrl+C to stop")
 
         try:
             while self.running:
                 try:
                     connection, address = self.socket.accept()
-                    logger.info(f"Connection from {address}")
-
-                    thread = threading.Thread(
-                        target=self._handle_connection,
-                        args=(connection, address),
-                        daemon=True,
+                    accept_metrics.connections_opened += 1
+                    self.reactor.park(
+                        HttpConnection(
+                            connection=connection, address=address, metrics=self.metrics
+                        )
                     )
-                    thread.start()
-                    self.threads.append(thread)
 
                 except (socket.error, socket.timeout) as e:
                     if self.running:
-                        logger.error("Socket error: {e}")
+                        logger.error(f"Socket error: {e}")
 
         except KeyboardInterrupt:
             self.shutdown()
 
-    def _handle_connection(self, connection: socket.socket, address: str) -> None:
-        http_connection = HttpConnection(connection=connection, address=address)
+    def _register_gauges(self) -> None:
+        reactor = self.reactor
+        self.metrics.register_gauge(
+            "http_worker_queue_depth",
+            "Readable connections waiting for a worker.",
+            self.connection_queue.qsize,
+        )
+        self.metrics.register_gauge(
+            "http_workers", "Worker threads.", lambda: len(self.worker_threads)
+        )
+        if reactor is not None:
+            self.metrics.register_gauge(
+                "http_idle_connections",
+                "Keep-alive connections parked on the reactor.",
+                lambda: reactor.parked,
+            )
+        admission = self.admission
+        if admission is not None:
+            self.metrics.register_gauge(
+                "http_in_flight_requests",
+                "Requests admitted and still in a handler.",
+                lambda: admission.in_flight,
+            )
+            self.metrics.register_gauge(
+                "http_queue_wait_seconds",
+                "Moving average of the time connections waited for a worker.",
+                lambda: admission.recent_queue_wait,
+            )
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None:
+            self.metrics.register_gauge(
+                "http_rate_limit_buckets",
+                "Clients tracked by the rate limiter's bucket table.",
+                lambda: len(rate_limiter),
+            )
+        access_log = self.access_log
+        if access_log is not None:
+            self.metrics.register_gauge(
+                "http_access_log_dropped",
+                "Access log entries dropped because the writer fell behind.",
+                lambda: access_log.dropped,
+            )
+
+    def _start_workers(self) -> None:
+        for index in range(self.max_connections):
+            worker = threading.Thread(
+                target=self._worker_loop, name=f"http-worker-{index}", daemon=True
+            )
+            worker.start()
+            self.worker_threads.append(worker)
+
+    def _enqueue_connection(self, http_connection: HttpConnection) -> None:
+        if self.admission is not None:
+            http_connection.enqueued_at = time.monotonic()
         try:
-            http_connection.set_timeout(self._CONNECTION_TIMEOUT)
-            keep_alive = True
+            self.connection_queue.put_nowait(http_connection)
+        except queue.Full:
+            address = http_connection.address
+            logger.warning(f"Connection queue full, rejecting {address}")
+            try:
+                http_connection.send_response(_SERVICE_UNAVAILABLE)
+            except OSError:
+                pass
+            finally:
+                http_connection.close()
+
+    def _worker_loop(self) -> None:
+        while self.running:
+            http_connection = self.connection_queue.get()
+            if http_connection is None:
+                break
+            if self.admission is not None:
+                self.admission.observe_queue_wait(
+                    time.monotonic() - http_connection.enqueued_at
+                )
+            try:
+                self._handle_connection(http_connection)
+            except Exception as e:
+                logger.error(
+                    f"Unhandled error on connection from {http_connection.address}: {e}"
+                )
+                http_connection.close()
+
+    def _handle_connection(self, http_connection: HttpConnection) -> None:
+        """
+        Serve a connection that has become readable.
+
+        Answers requests for as long as they arrive back to back, then parks the
+        connection on the reactor instead of blocking this worker while the client
+        is idle. Connections that should not be kept alive are closed.
+        """
+        address = http_connection.address
+        parser = http_connection.parser
+        metrics = self.metrics.shard()
+        received, sent = http_connection.bytes_received, http_connection.bytes_sent
+        keep_alive = True
+        try:
+            http_connection.set_timeout(self.request_timeout)
 
             while keep_alive and self.running:
                 try:
-                    request_data = b""
-                    while True:
-                        chunk = connection.recv(4096)
-                        if not chunk:
-                            break
-                        request_data += chunk
+                    request = self._read_request(http_connection)
+                    if request is None:
+                        keep_alive = False
+                        break
 
-                        if b"\r\n\r\n" in request_data:
+                    # Requests the client pipelined behind this one are already
+                    # buffered; answer them all with a single vectored send.
+                    buffers: list[bytes] = []
+                    timed: list[Request] = []
+                    batched = 0
+                    while request is not None:
+                        started = time.perf_counter()
+                        http_connection.served += 1
+                        response, keep_alive = self._handle_request(
+                            request, http_connection.served, address
+                        )
+                        if isinstance(response, bytes):
+                            # Rate limited or shed before the handler ran; the
+                            # code is read back from the pre-serialized status line.
+                            parts = [response]
+                            status = int(response[9:12])
+                            size = 0
+                        else:
+                            parts = response.serialize_parts(
+                                request.version != "HTTP/1.0"
+                            )
+                            status = response.status.code
+                            size = AccessLog.body_size(response, parts)
+                        buffers.extend(parts)
+                        batched += 1
+                        if isinstance(response, Response) and response.is_streaming:
+                            http_connection.send_buffers(buffers)
+                            buffers = []
+                            if not self._stream_body(http_connection, response):
+                                keep_alive = False
+                        duration = time.perf_counter() - started
+                        metrics.observe_request(
+                            request.metadata.route or UNMATCHED_ROUTE,
+                            request.method,
+                            status,
+                            duration,
+                        )
+                        if self.access_log is not None:
+                            self.access_log.log(
+                                address, request, status, size, duration
+                            )
+                        if request.metadata.timer is not None:
+                            timed.append(request)
+                        if not keep_alive or batched >= self._MAX_PIPELINE:
+                            break
+                        try:
+                            request = self._next_request(parser)
+                        except ParseError as e:
+                            buffers.append(self._reject(address, e))
+                            keep_alive = False
                             break
 
-                    if not request_data:
+                    send_started = time.perf_counter_ns()
+                    http_connection.send_buffers(buffers)
+                    if timed:
+                        self._log_slow_requests(timed, send_started)
+                    if not parser.in_progress and not http_connection.wait_readable(
+                        self._KEEP_ALIVE_LINGER
+                    ):
                         break
 
-                    request_str = request_data.decode("utf-8")
-                    logger.debug(f"Received request: {request_str}")
-
-                    request: Request = Request.deserialize(request_str)
-                    handler, path_params = self.router.match_route(request.path)
-
-                    if handler is None:
-                        response = Response(status=Status.NOT_FOUND)
-                    else:
-                        request.metadata.path_params.update(path_params)
-                        response = handler(request)
-
-                    connection_header = request.headers.get("Connection", "").lower()
-                    keep_alive = connection_header == "keep-alive" and self.running
-
-                    if keep_alive:
-                        response.headers["Connection"] = "keep-alive"
-                    else:
-                        response.headers["Connection"] = "close"
-
-                    http_connection.send_response(response.serialize())
-
                 except socket.timeout:
-                    logger.info(f"Connection from {address} timed out")
+                    logger.debug(f"Connection from {address} timed out")
+                    if parser.in_progress:
+                        http_connection.send_response(_REQUEST_TIMEOUT)
                     keep_alive = False
 
-                except Exception as e:
-                    logger.error(f"Error handling request: {e}")
-                    http_connection.send_response(
-                        Response(status=Status.INTERNAL_SERVER_ERROR).serialize()
-                    )
+                except ParseError as e:
+                    http_connection.send_response(self._reject(address, e))
+                    keep_alive = False
+
+                except OSError as e:
+                    logger.debug(f"Connection from {address} failed: {e}")
+                    keep_alive = False
 
         finally:
-            http_connection.close()
-            logger.info(f"Connection from {address} closed")
+            metrics.bytes_received += http_connection.bytes_received - received
+            metrics.bytes_sent += http_connection.bytes_sent - sent
+            if keep_alive and self.running and self.reactor is not None:
+                parser.release()
+                self.reactor.park(http_connection)
+            else:
+                http_connection.close()
+
+    def _stream_body(self, http_connection: HttpConnection, response: Response) -> bool:
+        try:
+            if isinstance(response.body, FileRange):
+                http_connection.send_file(response.body)
+                return True
+            for parts in response.iter_body_parts():
+                http_connection.send_buffers(parts)
+        except OSError:
+            raise
+        except Exception as e:
+            # The head is already on the wire; all we can do is cut the body short.
+            logger.error(f"Error streaming response body: {e}")
+            return False
+        return True
+
+    def _handle_request(
+        self, request: Request, served: int, address: tuple | str = ""
+    ) -> tuple[Response | bytes, bool]:
+        """
+        Route a request and run its handler.
+
+        Args:
+            request (Request): The parsed request.
+            served (int): Requests served on the connection so far, this one
+                included.
+            address (tuple | str): The client address, for rate limiting.
+
+        Returns:
+            tuple[Response | bytes, bool]: The response and whether to keep the
+                connection open. The response is a pre-serialized 429 or 503 when
+                rate limiting or admission control rejected the request before
+                its handler ran; the connection is then closed.
+        """
+        timer = request.metadata.timer
+        rate_limiter = self.rate_limiter
+        try:
+            client = ""
+            if rate_limiter is not None:
+                client = rate_limiter.client_key(address, request)
+                limit = rate_limiter.default
+                if limit is not None and not rate_limiter.allow(client, limit):
+                    return limit.rejection, False
+
+            started = time.perf_counter_ns() if timer is not None else 0
+            handler, path_params, route = self.router.match(request.path)
+            request.metadata.route = route
+            if timer is not None:
+                started = timer.record(Phase.ROUTE, started)
+
+            if handler is None:
+                response = Response(status=Status.NOT_FOUND)
+            else:
+                if rate_limiter is not None:
+                    limit = self.router.rate_limit(route)
+                    if limit is not None and not rate_limiter.allow(
+                        client, limit, route
+                    ):
+                        return limit.rejection, False
+                priority = Priority.NORMAL
+                if self.admission is not None:
+                    priority = self.router.priority(route)
+                    if not self.admission.admit(priority):
+                        return self.admission.rejection, False
+                request.metadata.path_params.update(path_params)
+                profiler = self.profiler
+                try:
+                    if profiler is not None and profiler.should_profile(route):
+                        response = profiler.run(handler, request)
+                    else:
+                        response = handler(request)
+                finally:
+                    if self.admission is not None:
+                        self.admission.release(priority)
+                if timer is not None:
+                    # Compression ran inside the handler call and timed itself.
+                    timer.record(Phase.HANDLER, started)
+                    timer.phases[Phase.HANDLER] -= timer.phases.get(Phase.COMPRESS, 0)
+
+        except Exception as e:
+            logger.error(f"Error handling request: {e}")
+            response = Response(status=Status.INTERNAL_SERVER_ERROR)
+
+        if timer is not None and self.timing is not None and self.timing.server_timing:
+            response.headers["Server-Timing"] = timer.server_timing()
+
+        drop_unsendable_body(request, response)
+        keep_alive = set_keep_alive(
+            request,
+            response,
+            served,
+            self.max_keep_alive_requests,
+            self.request_timeout,
+        )
+        return response, keep_alive and self.running
+
+    def _reject(self, address: str, error: ParseError) -> bytes:
+        logger.warning(f"Rejected request from {address}: {error}")
+        return Response(
+            status=error.status, headers={"Connection": "close"}
+        ).serialize()
+
+    def _next_request(
+        self, parser: RequestParser, timer: PhaseTimer | None = None
+    ) -> Request | None:
+        if self.timing is None:
+            return parser.next_request()
+
+        timer = timer or PhaseTimer()
+        started = time.perf_counter_ns()
+        request = parser.next_request()
+        timer.record(Phase.PARSE, started)
+        if request is not None:
+            request.metadata.timer = timer
+        return request
+
+    def _log_slow_requests(self, requests: list[Request], send_started: int) -> None:
+        assert self.timing is not None
+        for request in requests:
+            timer = request.metadata.timer
+            assert timer is not None
+            # Pipelined responses share one send; each is charged for all of it.
+            timer.record(Phase.SEND, send_started)
+            self.timing.log_if_slow(request.method, request.path, timer)
+
+    def _read_request(self, http_connection: HttpConnection) -> Request | None:
+        # An idle connection may wait request_timeout for its next request; once
+        # bytes of a request have arrived the whole request must follow within
+        # the same window, so slow senders cannot pin a worker indefinitely.
+        parser = http_connection.parser
+        timer = PhaseTimer() if self.timing is not None else None
+        request = self._next_request(parser, timer)
+        deadline: float | None = None
+        while request is None:
+            if parser.continue_expected():
+                http_connection.send_response(CONTINUE)
+            if parser.in_progress:
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self.request_timeout
+                elif now >= deadline:
+                    raise socket.timeout("Request not received in time")
+                http_connection.set_timeout(deadline - now)
+            started = time.perf_counter_ns()
+            received = http_connection.recv()
+            if timer is not None:
+                timer.record(Phase.RECV, started)
+            if not received:
+                return None
+            request = self._next_request(parser, timer)
+        if deadline is not None:
+            http_connection.set_timeout(self.request_timeout)
+        return request
 
     def shutdown(self) -> None:
         """
         Gracefully shuts down the server.
 
-        Sets the running flag to False, closes the server socket, and waits for all client
-        connection threads to complete. Times out thread joins after self._THREAD_TIMEOUT seconds.
+        Sets the running flag to False, closes the server socket, wakes every idle
+        worker and waits for them to finish. Times out worker joins after
+        self._THREAD_TIMEOUT seconds.
         """
         logger.info("Shutting down server...")
 
         self.running = False
-        try:
-            self.socket.close()
-        except Exception:
-            pass
-
-        for thread in self.threads:
-            thread.join(timeout=self._THREAD_TIMEOUT)
+        self.close_socket()
+        if self.reactor is not None:
+            self.reactor.stop()
+
+        for _ in self.worker_threads:
+            try:
+                self.connection_queue.put(None, timeout=self._THREAD_TIMEOUT)
+            except queue.Full:
+                break
+        for worker in self.worker_threads:
+            worker.join(timeout=self._THREAD_TIMEOUT)
+        if self.access_log is not None:
+            self.access_log.stop()
         logger.info("Server stopped")
-
-    def _cleanup_threads(self) -> None:
-        while self.running:
-            self.threads = [thread for thread in self.threads if thread.is_alive()]
-
-            threading.Event().wait(self._THREAD_CLEANUP_INTERVAL)
@@ -0,0 +1,235 @@
+import logging
+import mimetypes
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+
+from app.compression import CompressionType, negotiate_encoding
+from app.handler import BaseHandler
+from app.http.request import Request
+from app.http.response import FileRange, Response
+from app.http.status import Status
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FileInfo:
+    path: str
+    size: int
+    mtime: float
+    etag: str
+    last_modified: str
+    content_type: str
+    gzip_path: str | None
+    gzip_size: int
+    gzip_etag: str
+
+
+class StaticFileHandler(BaseHandler):
+    """Serves files below a root directory.
+
+    Register it with a catch-all path parameter, binding the root with a partial:
+
+        router.add_route(
+            "/static/{path:path}", partial(StaticFileHandler, root="public")
+        )
+
+    File contents are sent with sendfile and never pass through Python. Stat
+    results are cached for a short time, ``Range`` requests get 206 replies,
+    ``If-None-Match``/``If-Modified-Since`` get 304 replies, and a precompressed
+    ``<file>.gz`` sidecar is served to clients that accept gzip, under an ETag of
+    its own since its bytes differ from the file's.
+    """
+
+    _STAT_CACHE_TTL: float = 2.0
+    _STAT_CACHE_SIZE: int = 1024
+
+    def __init__(self, root: str = "static", path_param: str = "path") -> None:
+        self.root: str = os.path.realpath(root)
+        self.path_param: str = path_param
+        self._stat_cache: OrderedDict[str, tuple[FileInfo | None, float]]
+        self._stat_cache = OrderedDict()
+        self._stat_cache_lock = threading.Lock()
+
+    def get(self, request: Request) -> Response:
+        info = self._file_info(request.metadata.path_params.get(self.path_param, ""))
+        if info is None:
+            return Response(status=Status.NOT_FOUND)
+
+        gzipped = info.gzip_path is not None and self._accepts_gzip(request)
+        etag = info.gzip_etag if gzipped else info.etag
+        headers = {
+            "Content-Type": info.content_type,
+            "ETag": etag,
+            "Last-Modified": info.last_modified,
+            "Accept-Ranges": "bytes",
+        }
+        if info.gzip_path is not None:
+            headers["Vary"] = "Accept-Encoding"
+
+        if self._is_not_modified(request, info, etag):
+            return Response(status=Status.NOT_MODIFIED, headers=headers)
+
+        # Ranges are always served from the uncompressed file.
+        range_header = request.headers.get("Range")
+        if range_header and request.headers.get("If-Range", info.etag) == info.etag:
+            headers["ETag"] = info.etag
+            response = self._range_response(range_header, headers, info)
+            if response is not None:
+                return response
+            headers["ETag"] = etag
+
+        if gzipped and info.gzip_path is not None:
+            headers["Content-Encoding"] = "gzip"
+            return self._file_response(
+                Status.OK, headers, info.gzip_path, 0, info.gzip_size
+            )
+
+        return self._file_response(Status.OK, headers, info.path, 0, info.size)
+
+    def _range_response(
+        self, range_header: str, headers: dict, info: FileInfo
+    ) -> Response | None:
+        try:
+            byte_range = self._parse_range(range_header, info.size)
+        except ValueError:
+            return None
+
+        if byte_range is None:
+            headers["Content-Range"] = f"bytes */{info.size}"
+            return Response(status=Status.RANGE_NOT_SATISFIABLE, headers=headers)
+
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+        return self._file_response(
+            Status.PARTIAL_CONTENT, headers, info.path, start, end - start + 1
+        )
+
+    def _file_response(
+        self, status: Status, headers: dict, path: str, offset: int, count: int
+    ) -> Response:
+        try:
+            file = open(path, "rb")
+        except OSError as e:
+            logger.warning(f"Could not open {path}: {e}")
+            return Response(status=Status.NOT_FOUND)
+        return Response(
+            status=status, headers=headers, body=FileRange(file, offset, count)
+        )
+
+    def _file_info(self, relative_path: str) -> FileInfo | None:
+        now = time.monotonic()
+        with self._stat_cache_lock:
+            cached = self._stat_cache.get(relative_path)
+            if cached is not None and now - cached[1] < self._STAT_CACHE_TTL:
+                self._stat_cache.move_to_end(relative_path)
+                return cached[0]
+
+        info = self._stat(relative_path)
+        with self._stat_cache_lock:
+            self._stat_cache[relative_path] = (info, now)
+            self._stat_cache.move_to_end(relative_path)
+            if len(self._stat_cache) > self._STAT_CACHE_SIZE:
+                self._stat_cache.popitem(last=False)
+        return info
+
+    def _stat(self, relative_path: str) -> FileInfo | None:
+        path = os.path.realpath(os.path.join(self.root, relative_path))
+        if not path.startswith(self.root + os.sep):
+            return None
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+
+        gzip_path: str | None = path + ".gz"
+        gzip_size = 0
+        gzip_etag = ""
+        try:
+            gzip_stat = os.stat(path + ".gz")
+            # A sidecar older than its source is stale; serve the source instead.
+            if (
+                stat.S_ISREG(gzip_stat.st_mode)
+                and gzip_stat.st_mtime >= file_stat.st_mtime
+            ):
+                gzip_size = gzip_stat.st_size
+                gzip_etag = f'"{gzip_stat.st_mtime_ns:x}-{gzip_size:x}-gz"'
+            else:
+                gzip_path = None
+        except OSError:
+            gzip_path = None
+
+        return FileInfo(
+            path=path,
+            size=file_stat.st_size,
+            mtime=file_stat.st_mtime,
+            etag=f'"{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}"',
+            last_modified=formatdate(file_stat.st_mtime, usegmt=True),
+            content_type=mimetypes.guess_type(path)[0] or "application/octet-stream",
+            gzip_path=gzip_path,
+            gzip_size=gzip_size,
+            gzip_etag=gzip_etag,
+        )
+
+    def _is_not_modified(self, request: Request, info: FileInfo, etag: str) -> bool:
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+
+        if_modified_since = request.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(info.mtime) <= since
+        return False
+
+    def _parse_range(self, range_header: str, size: int) -> tuple[int, int] | None:
+        """
+        Parse a single-range Range header against a file size.
+
+        Args:
+            range_header (str): The Range header value, e.g. "bytes=0-499".
+            size (int): Size of the file in bytes.
+
+        Returns:
+            tuple[int, int] | None: Inclusive start and end offsets, or None if the
+                range cannot be satisfied.
+
+        Raises:
+            ValueError: If the header is malformed or asks for several ranges, in
+                which case the whole file is served.
+        """
+        unit, _, spec = range_header.partition("=")
+        if unit.strip().lower() != "bytes" or "," in spec:
+            raise ValueError(f"Unsupported range: {range_header}")
+        first, separator, last = spec.strip().partition("-")
+        if not separator:
+            raise ValueError(f"Invalid range: {range_header}")
+
+        if not first:
+            suffix = int(last)
+            if suffix <= 0 or size == 0:
+                return None
+            return max(0, size - suffix), size - 1
+
+        start = int(first)
+        end = int(last) if last else size - 1
+        if start >= size:
+            return None
+        if start < 0 or end < start:
+            raise ValueError(f"Invalid range: {range_header}")
+        return start, min(end, size - 1)
+
+    def _accepts_gzip(self, request: Request) -> bool:
+        accept_encoding = request.headers.get("Accept-Encoding", "")
+        return negotiate_encoding(accept_encoding, (CompressionType.GZIP,)) is not None
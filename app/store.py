@@ -0,0 +1,195 @@
+import bisect
+import heapq
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor was not produced by the store."""
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a store listing.
+
+    Attributes:
+        items (list[tuple[int, T]]): (id, item) pairs in ascending id order.
+        next_cursor (str | None): Cursor for the following page, or None when this
+            page reached the end.
+    """
+
+    items: list[tuple[int, T]]
+    next_cursor: str | None
+
+
+class _Shard(Generic[T]):
+    __slots__ = ("lock", "items", "ids", "version")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.items: dict[int, T] = {}
+        # Kept sorted so a page can start from a cursor with a bisect.
+        self.ids: list[int] = []
+        # Odd while ids is being changed, bumped again once it is consistent.
+        self.version: int = 0
+
+
+class ShardedStore(Generic[T]):
+    """Thread-safe in-memory store of items keyed by integer ids.
+
+    Items are spread over shards by id, each guarded by its own lock, so
+    concurrent requests touching different items rarely wait on each other. Ids
+    come from a shared counter whose increments are atomic, so allocating one
+    takes no lock and no scan of existing ids.
+
+    Reads take no lock. get() is a single dict lookup, atomic under the GIL. A
+    listing bisects and slices each shard's sorted id list optimistically: writers
+    bump the shard's version before and after changing the list, and a slice
+    taken while the version changed is retaken under the shard's lock, so a
+    concurrent delete can never shift the list between the bisect and the slice.
+
+    Listings are paginated with opaque cursors encoding the last id returned.
+    A page merges the next ids of every shard, found by bisecting each shard's
+    sorted id list, so its cost depends on the page size rather than the size of
+    the store. A listing never repeats an item, and deletes, whether between
+    pages or while one is read, never make it skip an item that remains. Items
+    created meanwhile are only listed if their id lands past the cursor, so one
+    created concurrently with a page may be missed.
+
+    Stored items are returned as is; replace them with update() rather than
+    mutating them in place, so readers never see a half-written item.
+    """
+
+    def __init__(self, shards: int = 16) -> None:
+        self._shards: list[_Shard[T]] = [_Shard() for _ in range(shards)]
+        self._ids: Iterator[int] = itertools.count(1)
+
+    def __len__(self) -> int:
+        return sum(len(shard.items) for shard in self._shards)
+
+    def __contains__(self, item_id: object) -> bool:
+        return isinstance(item_id, int) and item_id in self._shard(item_id).items
+
+    def next_id(self) -> int:
+        """Allocate a new id; next() on a counter is atomic under the GIL."""
+        return next(self._ids)
+
+    def create(self, build: Callable[[int], T]) -> T:
+        """
+        Store a new item under a freshly allocated id.
+
+        Args:
+            build (Callable[[int], T]): Builds the item from its id.
+
+        Returns:
+            T: The stored item.
+        """
+        item_id = self.next_id()
+        item = build(item_id)
+        shard = self._shard(item_id)
+        with shard.lock:
+            shard.items[item_id] = item
+            ids = shard.ids
+            shard.version += 1
+            if not ids or ids[-1] < item_id:
+                ids.append(item_id)
+            else:
+                bisect.insort(ids, item_id)
+            shard.version += 1
+        return item
+
+    def get(self, item_id: int) -> T | None:
+        return self._shard(item_id).items.get(item_id)
+
+    def update(self, item_id: int, item: T) -> bool:
+        """Replace an existing item, returning False if there is none."""
+        shard = self._shard(item_id)
+        with shard.lock:
+            if item_id not in shard.items:
+                return False
+            shard.items[item_id] = item
+        return True
+
+    def delete(self, item_id: int) -> bool:
+        """Remove an item, returning False if there is none."""
+        shard = self._shard(item_id)
+        with shard.lock:
+            if shard.items.pop(item_id, None) is None:
+                return False
+            ids = shard.ids
+            shard.version += 1
+            del ids[bisect.bisect_left(ids, item_id)]
+            shard.version += 1
+        return True
+
+    def page(self, limit: int, cursor: str | None = None) -> Page[T]:
+        """
+        List up to limit items in id order, starting after cursor.
+
+        Args:
+            limit (int): Maximum number of items to return.
+            cursor (str | None): next_cursor of the previous page, or None to
+                start from the beginning.
+
+        Returns:
+            Page[T]: The items and the cursor of the next page.
+
+        Raises:
+            InvalidCursorError: If cursor is malformed.
+            ValueError: If limit is less than 1.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        after = self._decode_cursor(cursor)
+        snapshots: list[list[int]] = []
+        for shard in self._shards:
+            # limit + 1 ids overall tell whether another page follows.
+            snapshots.append(self._slice_ids(shard, after, limit + 1))
+
+        page_ids = list(itertools.islice(heapq.merge(*snapshots), limit + 1))
+        items: list[tuple[int, T]] = []
+        for item_id in page_ids[:limit]:
+            item = self._shard(item_id).items.get(item_id)
+            # None when deleted since the snapshot was taken.
+            if item is not None:
+                items.append((item_id, item))
+        next_cursor = None
+        if len(page_ids) > limit:
+            next_cursor = self._encode_cursor(page_ids[limit - 1])
+        return Page(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def _slice_ids(shard: _Shard[T], after: int, count: int) -> list[int]:
+        """Up to count of a shard's ids greater than after, in ascending order."""
+        version = shard.version
+        if not version & 1:
+            ids = shard.ids
+            start = bisect.bisect_right(ids, after)
+            sliced = ids[start : start + count]
+            if shard.version == version:
+                return sliced
+        # A write ran between the bisect and the slice; redo both under the lock.
+        with shard.lock:
+            ids = shard.ids
+            start = bisect.bisect_right(ids, after)
+            return ids[start : start + count]
+
+    def _shard(self, item_id: int) -> _Shard[T]:
+        return self._shards[item_id % len(self._shards)]
+
+    @staticmethod
+    def _encode_cursor(item_id: int) -> str:
+        return format(item_id, "x")
+
+    @staticmethod
+    def _decode_cursor(cursor: str | None) -> int:
+        if not cursor:
+            return 0
+        try:
+            return int(cursor, 16)
+        except ValueError as e:
+            raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
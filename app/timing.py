@@ -0,0 +1,164 @@
+import cProfile
+import io
+import logging
+import pstats
+import random
+import threading
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class Phase(StrEnum):
+    RECV = "recv"
+    PARSE = "parse"
+    ROUTE = "route"
+    HANDLER = "handler"
+    COMPRESS = "compress"
+    SEND = "send"
+
+
+class PhaseTimer:
+    """Accumulates the time one request spends in each phase, in nanoseconds.
+
+    Phases are disjoint: compression time is subtracted from the handler phase by
+    the server, so the phases add up to the time the server spent on the request.
+    """
+
+    __slots__ = ("started", "phases")
+
+    def __init__(self) -> None:
+        self.started: int = time.perf_counter_ns()
+        self.phases: dict[Phase, int] = {}
+
+    def record(self, phase: Phase, started: int) -> int:
+        """
+        Add the time since started to a phase.
+
+        Args:
+            phase (Phase): The phase that just finished.
+            started (int): perf_counter_ns() value taken when it began.
+
+        Returns:
+            int: The current perf_counter_ns(), to start timing the next phase.
+        """
+        now = time.perf_counter_ns()
+        self.phases[phase] = self.phases.get(phase, 0) + now - started
+        return now
+
+    @property
+    def total(self) -> int:
+        return sum(self.phases.values())
+
+    def server_timing(self) -> str:
+        """Format the phases as a Server-Timing header value, in milliseconds."""
+        metrics = [
+            f"{phase};dur={self.phases[phase] / 1e6:.3f}"
+            for phase in Phase
+            if phase in self.phases
+        ]
+        metrics.append(f"total;dur={self.total / 1e6:.3f}")
+        return ", ".join(metrics)
+
+    def summary(self) -> str:
+        return " ".join(
+            f"{phase}={self.phases[phase] / 1e6:.2f}ms"
+            for phase in Phase
+            if phase in self.phases
+        )
+
+
+@dataclass
+class RequestTiming:
+    """Options for per-request phase timing.
+
+    Attributes:
+        server_timing (bool): Add a Server-Timing header with every phase up to
+            serialization. The send phase happens after the header is written, so
+            it only appears in the slow-request log.
+        slow_threshold (float | None): Log requests whose phases add up to more
+            than this many seconds, send included.
+    """
+
+    server_timing: bool = True
+    slow_threshold: float | None = None
+
+    def log_if_slow(self, method: str, path: str, timer: PhaseTimer) -> None:
+        if self.slow_threshold is None:
+            return
+        total = timer.total
+        if total >= self.slow_threshold * 1e9:
+            logger.warning(
+                f"Slow request {method} {path} took {total / 1e6:.2f}ms "
+                f"({timer.summary()})"
+            )
+
+
+class RequestProfiler:
+    """Runs a sample of requests under cProfile and aggregates their stats.
+
+    A request is profiled when its route pattern is in routes, or otherwise with
+    probability sample_rate. Both can be changed while the server runs, and dump()
+    renders the stats collected so far, so production traffic can be profiled
+    without a restart. Profiling is per thread, so concurrent workers can each
+    profile a request; only merging the results takes a lock.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, routes: Iterable[str] = ()) -> None:
+        self.sample_rate: float = sample_rate
+        self.routes: set[str] = set(routes)
+        self.profiled: int = 0
+        self._stats: pstats.Stats | None = None
+        self._lock = threading.Lock()
+
+    def should_profile(self, route: str) -> bool:
+        if route in self.routes:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Call func(*args) under cProfile and add its stats to the aggregate."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active on this thread.
+            return func(*args)
+        try:
+            return func(*args)
+        finally:
+            profile.disable()
+            with self._lock:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+                self.profiled += 1
+
+    def dump(self, sort: str = "cumulative", limit: int = 40) -> str:
+        """
+        Render the aggregated stats as text.
+
+        Args:
+            sort (str): pstats sort key, e.g. "cumulative" or "tottime".
+            limit (int): Maximum number of functions listed.
+
+        Returns:
+            str: The pstats report, or a note that nothing was profiled yet.
+        """
+        with self._lock:
+            if self._stats is None:
+                return "No requests profiled yet.\n"
+            output = io.StringIO()
+            self._stats.stream = output  # type: ignore[attr-defined]
+            output.write(f"{self.profiled} requests profiled\n")
+            self._stats.sort_stats(sort).print_stats(limit)
+            return output.getvalue()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = None
+            self.profiled = 0
@@ -0,0 +1,103 @@
+"""Benchmark suite entry point.
+
+    python -m bench run [--duration 5] [--scenario NAME ...] [--skip-micro]
+    python -m bench micro [--number 20000]
+    python -m bench compare BASELINE CURRENT [--threshold 0.10]
+
+``run`` executes the load scenarios and the microbenchmarks and writes them,
+with the git revision and machine details, to ``bench/results/latest.json``
+unless ``--output`` says otherwise. Copy a run to ``bench/results/baseline.json``
+to use it as the reference for ``compare``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from typing import Any
+
+from bench import compare, load, micro
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def environment(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("command", "handler")
+        },
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    results: dict[str, Any] = {"environment": environment(args)}
+
+    print(load.RESULT_HEADER)
+    results["scenarios"] = [asdict(result) for result in load.run_load(args)]
+
+    if not args.skip_micro:
+        print()
+        results["micro"] = micro.run_micro(args.number)
+        print(micro.format_micro(results["micro"]))
+
+    output = args.output or os.path.join(RESULTS_DIR, "latest.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nResults written to {output}")
+    return 0
+
+
+def run_micro_only(args: argparse.Namespace) -> int:
+    print(micro.format_micro(micro.run_micro(args.number)))
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run load scenarios and micro")
+    load.add_arguments(run_parser)
+    run_parser.add_argument("--number", type=int, default=20000)
+    run_parser.add_argument("--skip-micro", action="store_true")
+    run_parser.add_argument("--output", help="defaults to bench/results/latest.json")
+    run_parser.set_defaults(handler=run)
+
+    micro_parser = commands.add_parser("micro", help="run the microbenchmarks")
+    micro_parser.add_argument("--number", type=int, default=20000)
+    micro_parser.set_defaults(handler=run_micro_only)
+
+    compare_parser = commands.add_parser("compare", help="diff two result files")
+    compare.add_arguments(compare_parser)
+    compare_parser.set_defaults(handler=compare.run_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import socket
+import time
+
+
+UNIX_PREFIX = "unix:"
+
+
+def open_connection(host: str, port: int, timeout: float = 10.0) -> socket.socket:
+    """Connect to host and port, or to the Unix domain socket in a "unix:" host."""
+    if host.startswith(UNIX_PREFIX):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(host[len(UNIX_PREFIX) :])
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    sock = socket.create_connection((host, port), timeout=timeout)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def build_request(
+    method: str = "GET",
+    path: str = "/",
+    body: bytes = b"",
+    headers: dict[str, str] | None = None,
+    keep_alive: bool = True,
+) -> bytes:
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost"]
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    for key, value in (headers or {}).items():
+        lines.append(f"{key}: {value}")
+    if body:
+        lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+
+def read_response(sock: socket.socket, buffer: bytearray) -> tuple[int, bytes]:
+    """Read one Content-Length delimited response, keeping any surplus in buffer."""
+    status, _, body = read_response_with_headers(sock, buffer)
+    return status, body
+
+
+def read_response_with_headers(
+    sock: socket.socket, buffer: bytearray
+) -> tuple[int, dict[str, str], bytes]:
+    """Like read_response, also returning the headers with lower-cased names."""
+    while True:
+        end = buffer.find(b"\r\n\r\n")
+        if end != -1:
+            break
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("connection closed before response headers")
+        buffer += chunk
+
+    head = bytes(buffer[:end]).decode("latin-1")
+    del buffer[: end + 4]
+    status = int(head.split(" ", 2)[1])
+    headers: dict[str, str] = {}
+    for line in head.split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+
+    while len(buffer) < length:
+        chunk = sock.recv(65536)
+        if not chunk:
+            raise ConnectionError("connection closed before response body")
+        buffer += chunk
+    body = bytes(buffer[:length])
+    del buffer[:length]
+    return status, headers, body
+
+
+def request_loop(
+    host: str, port: int, request: bytes, duration: float
+) -> tuple[int, int, list[float]]:
+    """Send request back-to-back on one keep-alive connection for duration seconds.
+
+    Returns:
+        tuple[int, int, list[float]]: Completed requests, errors and per-request
+            latencies in seconds.
+    """
+    completed = errors = 0
+    latencies: list[float] = []
+    buffer = bytearray()
+    sock = open_connection(host, port)
+    deadline = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                sock.sendall(request)
+                _, headers, _ = read_response_with_headers(sock, buffer)
+            except OSError:
+                errors += 1
+                sock.close()
+                buffer.clear()
+                sock = open_connection(host, port)
+                continue
+            latencies.append(time.perf_counter() - started)
+            completed += 1
+            if headers.get("connection") == "close":
+                # The server's per-connection request limit; not an error.
+                sock.close()
+                buffer.clear()
+                sock = open_connection(host, port)
+    finally:
+        sock.close()
+    return completed, errors, latencies
@@ -0,0 +1,133 @@
+"""Compare two benchmark result files and flag regressions.
+
+Both files are JSON written by ``python -m bench run``. A scenario regresses when
+its RPS drops, or its p99 latency grows, by more than the threshold; a
+microbenchmark regresses when its ns/op grows by more than the threshold.
+Exits with status 1 when anything regressed.
+
+    python -m bench compare bench/results/baseline.json bench/results/latest.json
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class Change:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    higher_is_better: bool
+
+    @property
+    def ratio(self) -> float:
+        """Relative change, positive when current is better than baseline."""
+        if self.baseline == 0:
+            return 0.0
+        delta = (self.current - self.baseline) / self.baseline
+        return delta if self.higher_is_better else -delta
+
+    def regressed(self, threshold: float) -> bool:
+        return self.ratio < -threshold
+
+
+def load_results(path: str) -> dict[str, Any]:
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any]) -> list[Change]:
+    """
+    Pair up the metrics present in both result files.
+
+    Args:
+        baseline (dict[str, Any]): The stored reference results.
+        current (dict[str, Any]): The results to check.
+
+    Returns:
+        list[Change]: RPS and p99 per scenario, then ns/op per microbenchmark.
+    """
+    changes: list[Change] = []
+    base_scenarios = {s["name"]: s for s in baseline.get("scenarios", [])}
+    for scenario in current.get("scenarios", []):
+        base = base_scenarios.get(scenario["name"])
+        if base is None:
+            continue
+        changes.append(
+            Change(scenario["name"], "rps", base["rps"], scenario["rps"], True)
+        )
+        changes.append(
+            Change(
+                scenario["name"], "p99_ms", base["p99_ms"], scenario["p99_ms"], False
+            )
+        )
+
+    base_micro = baseline.get("micro", {})
+    for name, ns in current.get("micro", {}).items():
+        if name in base_micro:
+            changes.append(Change(name, "ns/op", base_micro[name], ns, False))
+    return changes
+
+
+def format_changes(
+    changes: list[Change], load_threshold: float, micro_threshold: float
+) -> str:
+    lines = [
+        f"{'benchmark':<28}{'metric':<8}{'baseline':>12}{'current':>12}"
+        f"{'change':>9}"
+    ]
+    for change in changes:
+        threshold = micro_threshold if change.metric == "ns/op" else load_threshold
+        flag = "  REGRESSION" if change.regressed(threshold) else ""
+        lines.append(
+            f"{change.name:<28}{change.metric:<8}{change.baseline:>12.2f}"
+            f"{change.current:>12.2f}{change.ratio:>+9.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("baseline", help="stored baseline results")
+    parser.add_argument("current", help="results to check against the baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="tolerated RPS drop or p99 increase, as a fraction",
+    )
+    parser.add_argument(
+        "--micro-threshold",
+        type=float,
+        default=0.15,
+        help="tolerated ns/op increase for microbenchmarks, as a fraction",
+    )
+
+
+def run_compare(args: argparse.Namespace) -> int:
+    changes = compare_results(load_results(args.baseline), load_results(args.current))
+    print(format_changes(changes, args.threshold, args.micro_threshold))
+    regressions = [
+        change
+        for change in changes
+        if change.regressed(
+            args.micro_threshold if change.metric == "ns/op" else args.threshold
+        )
+    ]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond the threshold")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    sys.exit(run_compare(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
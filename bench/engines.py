@@ -0,0 +1,143 @@
+"""Compare the threaded and asyncio server engines.
+
+Each engine runs in its own process. The benchmark first opens ``--connections``
+keep-alive clients that each complete one request and then stay idle, and counts
+how many the server holds. With those connections still open, ``--clients``
+threads issue back-to-back requests for ``--duration`` seconds to measure RPS.
+
+    python -m bench.engines --connections 2000 --clients 8 --duration 5
+"""
+
+import argparse
+import resource
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench.client import build_request, open_connection, read_response, request_loop
+
+ENGINES = ("threaded", "async")
+
+
+def serve(engine: str, host: str, port: int) -> None:
+    from app.async_server import AsyncHttpServer
+    from app.server import HttpServer
+    from demo.handlers import EchoHandler, HomeHandler, TimeHandler
+
+    server: HttpServer | AsyncHttpServer
+    if engine == "threaded":
+        server = HttpServer(host, port)
+    else:
+        server = AsyncHttpServer(host, port)
+    server.router.add_route("/", HomeHandler)
+    server.router.add_route("/time", TimeHandler)
+    server.router.add_route("/echo/{message}", EchoHandler)
+    server.run()
+
+
+def raise_fd_limit() -> int:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    try:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        return hard
+    except (ValueError, OSError):
+        return soft
+
+
+def start_server(engine: str, host: str, port: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "bench.engines", "--serve", engine, "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"{engine} server did not start on port {port}")
+
+
+def hold_connections(host: str, port: int, count: int) -> list[socket.socket]:
+    request = build_request(path="/time")
+    held: list[socket.socket] = []
+    for _ in range(count):
+        try:
+            sock = open_connection(host, port, timeout=5)
+            sock.sendall(request)
+            status, _ = read_response(sock, bytearray())
+        except OSError:
+            break
+        if status != 200:
+            sock.close()
+            break
+        held.append(sock)
+    return held
+
+
+def run_engine(engine: str, args: argparse.Namespace, port: int) -> dict:
+    process = start_server(engine, args.host, port)
+    held: list[socket.socket] = []
+    try:
+        held = hold_connections(args.host, port, args.connections)
+        request = build_request(path="/echo/hello")
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            results = list(
+                pool.map(
+                    lambda _: request_loop(args.host, port, request, args.duration),
+                    range(args.clients),
+                )
+            )
+    finally:
+        for sock in held:
+            sock.close()
+        process.terminate()
+        process.wait(timeout=10)
+
+    completed = sum(result[0] for result in results)
+    latencies = sorted(latency for result in results for latency in result[2])
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0.0
+    return {
+        "engine": engine,
+        "connections_held": len(held),
+        "rps": completed / args.duration,
+        "errors": sum(result[1] for result in results),
+        "p99_ms": p99 * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4300)
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--engine", choices=ENGINES, action="append")
+    parser.add_argument("--serve", choices=ENGINES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    limit = raise_fd_limit()
+    if args.serve:
+        serve(args.serve, args.host, args.port)
+        return
+
+    if args.connections + args.clients + 16 > limit:
+        print(f"warning: RLIMIT_NOFILE is {limit}, idle connections will be capped")
+
+    print(f"{'engine':<10}{'held':>8}{'rps':>12}{'p99 ms':>10}{'errors':>8}")
+    for offset, engine in enumerate(args.engine or ENGINES):
+        result = run_engine(engine, args, args.port + offset)
+        print(
+            f"{result['engine']:<10}{result['connections_held']:>8}"
+            f"{result['rps']:>12.0f}{result['p99_ms']:>10.2f}{result['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
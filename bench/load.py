@@ -0,0 +1,343 @@
+"""Multi-process load generator for the demo application.
+
+Starts ``demo.main`` on a local port and drives its routes through a set of
+scenarios. Each scenario runs ``--processes`` client processes with
+``--threads`` connections each. After a short warm-up it measures for
+``--duration`` seconds and reports RPS and p50/p99/p999 latency. Scenarios
+ending in ``_uds`` repeat their TCP counterparts against a second server
+listening on a Unix domain socket.
+
+    python -m bench.load --duration 5 --scenario keepalive --scenario gzip_on
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+from bench.client import (
+    UNIX_PREFIX,
+    build_request,
+    open_connection,
+    read_response,
+    read_response_with_headers,
+    request_loop,
+)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str = "GET"
+    path: str = "/echo/hello"
+    headers: dict[str, str] = field(default_factory=dict)
+    body_size: int = 0
+    keep_alive: bool = True
+    pipeline: int = 1
+    idle_connections: int = 0
+    unix_socket: bool = False
+
+    def request(self) -> bytes:
+        body = b""
+        if self.body_size:
+            body = json.dumps({"title": "x" * self.body_size, "completed": False})
+            body = body.encode()  # type: ignore[assignment]
+        return build_request(
+            self.method, self.path, body, self.headers, keep_alive=self.keep_alive
+        )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("keepalive"),
+        Scenario("keepalive_uds", unix_socket=True),
+        Scenario("close", keep_alive=False),
+        Scenario("close_uds", keep_alive=False, unix_socket=True),
+        Scenario("path_params", path="/todos/1"),
+        Scenario("gzip_off", path="/"),
+        Scenario("gzip_on", path="/", headers={"Accept-Encoding": "gzip"}),
+        Scenario("large_post", method="PUT", path="/todos/3", body_size=256 * 1024),
+        Scenario("pipelining", pipeline=16),
+        Scenario("idle_connections", idle_connections=1000),
+    )
+}
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p99_ms: float
+    p999_ms: float
+    idle_held: int = 0
+
+
+def percentile(latencies: list[float], fraction: float) -> float:
+    """Return the value below which fraction of the sorted latencies fall."""
+    if not latencies:
+        return 0.0
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+def close_loop(
+    host: str, port: int, request: bytes, duration: float
+) -> tuple[int, int, list[float]]:
+    """Open a new connection for every request, as clients without keep-alive do."""
+    completed = errors = 0
+    latencies: list[float] = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            sock = open_connection(host, port)
+            try:
+                sock.sendall(request)
+                read_response(sock, bytearray())
+            finally:
+                sock.close()
+        except OSError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        completed += 1
+    return completed, errors, latencies
+
+
+def pipeline_loop(
+    host: str, port: int, request: bytes, depth: int, duration: float
+) -> tuple[int, int, list[float]]:
+    """Send depth requests per write and read all responses before the next batch.
+
+    Every request in a batch is recorded with the latency of the whole batch.
+    """
+    completed = errors = 0
+    latencies: list[float] = []
+    batch = request * depth
+    buffer = bytearray()
+    sock = open_connection(host, port)
+    deadline = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            reconnect = False
+            try:
+                sock.sendall(batch)
+                for _ in range(depth):
+                    _, headers, _ = read_response_with_headers(sock, buffer)
+                    completed += 1
+                    if headers.get("connection") == "close":
+                        reconnect = True
+                        break
+            except OSError:
+                errors += 1
+                reconnect = True
+            else:
+                latencies.extend([time.perf_counter() - started] * depth)
+            if reconnect:
+                sock.close()
+                buffer.clear()
+                sock = open_connection(host, port)
+    finally:
+        sock.close()
+    return completed, errors, latencies
+
+
+def run_client(
+    scenario: Scenario, host: str, port: int, duration: float
+) -> tuple[int, int, list[float]]:
+    request = scenario.request()
+    if not scenario.keep_alive:
+        return close_loop(host, port, request, duration)
+    if scenario.pipeline > 1:
+        return pipeline_loop(host, port, request, scenario.pipeline, duration)
+    return request_loop(host, port, request, duration)
+
+
+def run_process(
+    scenario: Scenario, host: str, port: int, threads: int, duration: float
+) -> tuple[int, int, list[float]]:
+    """Entry point of one load-generating process: threads concurrent clients."""
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(
+            pool.map(
+                lambda _: run_client(scenario, host, port, duration), range(threads)
+            )
+        )
+    return (
+        sum(result[0] for result in results),
+        sum(result[1] for result in results),
+        [latency for result in results for latency in result[2]],
+    )
+
+
+def hold_idle_connections(host: str, port: int, count: int) -> list[socket.socket]:
+    """Open count keep-alive connections that each complete one request."""
+    request = build_request(path="/time")
+    held: list[socket.socket] = []
+    for _ in range(count):
+        try:
+            sock = open_connection(host, port, timeout=5)
+            sock.sendall(request)
+            status, _ = read_response(sock, bytearray())
+        except OSError:
+            break
+        if status != 200:
+            sock.close()
+            break
+        held.append(sock)
+    return held
+
+
+def run_scenario(
+    scenario: Scenario,
+    host: str,
+    port: int,
+    processes: int,
+    threads: int,
+    duration: float,
+    warmup: float,
+) -> ScenarioResult:
+    held = hold_idle_connections(host, port, scenario.idle_connections)
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            if warmup > 0:
+                list(
+                    pool.map(
+                        run_process,
+                        *zip(*[(scenario, host, port, threads, warmup)] * processes),
+                    )
+                )
+            results = list(
+                pool.map(
+                    run_process,
+                    *zip(*[(scenario, host, port, threads, duration)] * processes),
+                )
+            )
+    finally:
+        for sock in held:
+            sock.close()
+
+    completed = sum(result[0] for result in results)
+    latencies = sorted(latency for result in results for latency in result[2])
+    return ScenarioResult(
+        name=scenario.name,
+        requests=completed,
+        errors=sum(result[1] for result in results),
+        rps=completed / duration,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        p999_ms=percentile(latencies, 0.999) * 1000,
+        idle_held=len(held),
+    )
+
+
+def start_demo_server(
+    host: str, port: int, workers: int | None = None
+) -> subprocess.Popen:
+    """Start demo.main on host and port, or on the socket in a "unix:" host."""
+    command = [sys.executable, "-m", "demo.main"]
+    if host.startswith(UNIX_PREFIX):
+        command += ["--unix-socket", host[len(UNIX_PREFIX) :]]
+    else:
+        command += ["--host", host, "--port", str(port)]
+    if workers is not None:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(
+        command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            open_connection(host, port, timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"demo server did not start on {host}:{port}")
+
+
+def run_load(args: argparse.Namespace) -> list[ScenarioResult]:
+    names = args.scenario or list(SCENARIOS)
+    scenarios = [SCENARIOS[name] for name in names]
+    servers: list[subprocess.Popen] = []
+    results: list[ScenarioResult] = []
+    with tempfile.TemporaryDirectory(prefix="bench-") as directory:
+        unix_host = UNIX_PREFIX + os.path.join(directory, "http.sock")
+        try:
+            if any(not scenario.unix_socket for scenario in scenarios):
+                servers.append(
+                    start_demo_server(args.host, args.port, args.server_workers)
+                )
+            if any(scenario.unix_socket for scenario in scenarios):
+                servers.append(
+                    start_demo_server(unix_host, args.port, args.server_workers)
+                )
+            for scenario in scenarios:
+                result = run_scenario(
+                    scenario,
+                    unix_host if scenario.unix_socket else args.host,
+                    args.port,
+                    args.processes,
+                    args.threads,
+                    args.duration,
+                    args.warmup,
+                )
+                print(format_result(result), flush=True)
+                results.append(result)
+        finally:
+            for process in servers:
+                process.terminate()
+                process.wait(timeout=10)
+    return results
+
+
+def format_result(result: ScenarioResult) -> str:
+    idle = f"  idle={result.idle_held}" if result.idle_held else ""
+    return (
+        f"{result.name:<18}{result.rps:>10.0f}{result.p50_ms:>10.2f}"
+        f"{result.p99_ms:>10.2f}{result.p999_ms:>10.2f}{result.errors:>8}{idle}"
+    )
+
+
+RESULT_HEADER = (
+    f"{'scenario':<18}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'p999 ms':>10}"
+    f"{'errors':>8}"
+)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4360)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--server-workers", type=int, default=None)
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    print(RESULT_HEADER)
+    results = run_load(args)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"scenarios": [asdict(r) for r in results]}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
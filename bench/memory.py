@@ -0,0 +1,109 @@
+"""Allocation benchmark for requests and responses.
+
+Uses tracemalloc to measure the bytes and allocated blocks retained per parsed
+request, per default-header response, and per request/response pair after the
+server has read its headers and serialized the response.
+
+    python -m bench.memory --requests 10000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable
+
+from app.http.parser import RequestParser
+from app.http.request import Request
+from app.http.response import Response
+from app.http.status import Status
+
+REQUEST = (
+    b"GET /todos/42 HTTP/1.1\r\n"
+    b"Host: localhost:4221\r\n"
+    b"User-Agent: bench/1.0\r\n"
+    b"Accept: application/json\r\n"
+    b"Accept-Encoding: gzip, deflate\r\n"
+    b"Connection: keep-alive\r\n"
+    b"\r\n"
+)
+
+
+def parse_requests(count: int) -> list[Request]:
+    parser = RequestParser()
+    requests = []
+    for _ in range(count):
+        parser.feed(REQUEST)
+        request = parser.next_request()
+        assert request is not None
+        requests.append(request)
+    return requests
+
+
+def build_responses(count: int) -> list[Response]:
+    return [Response(status=Status.NOT_FOUND) for _ in range(count)]
+
+
+def serve(count: int) -> list[tuple[Request, Response]]:
+    """Parse, read what the server reads and serialize, keeping both objects.
+
+    This is what a worker holds for each request of a pipelined batch.
+    """
+    parser = RequestParser()
+    served = []
+    for _ in range(count):
+        parser.feed(REQUEST)
+        request = parser.next_request()
+        assert request is not None
+        request.metadata.route = "/todos/{id}"
+        response = Response(status=Status.OK, body="ok")
+        response.headers["Connection"] = (
+            "keep-alive" if request.keep_alive else "close"
+        )
+        response.serialize_parts()
+        served.append((request, response))
+    return served
+
+
+def measure(func: Callable[[int], list], count: int) -> tuple[float, float]:
+    """
+    Run func(count) under tracemalloc and attribute the growth to each item.
+
+    Args:
+        func (Callable[[int], list]): Builds and returns count objects.
+        count (int): Number of objects.
+
+    Returns:
+        tuple[float, float]: Bytes and allocated blocks still held per object.
+    """
+    func(min(count, 100))  # Warm caches so they are not charged to the run.
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = func(count)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del objects
+    return size / count, blocks / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'case':<28}{'bytes':>10}{'blocks':>10}")
+    for name, func in (
+        ("parsed request (retained)", parse_requests),
+        ("404 response (retained)", build_responses),
+        ("served request + response", serve),
+    ):
+        size, blocks = measure(func, args.requests)
+        print(f"{name:<28}{size:>10.0f}{blocks:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Measure the throughput cost of request metrics.
+
+Runs the threaded server twice in separate processes, once recording metrics as
+usual and once with a metrics registry whose shards discard every observation,
+and compares RPS over ``--duration`` seconds with ``--clients`` keep-alive
+clients.
+
+    python -m bench.metrics_overhead --clients 8 --duration 5
+"""
+
+import argparse
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench.client import build_request, request_loop
+
+MODES = ("disabled", "enabled")
+
+
+def serve(mode: str, host: str, port: int) -> None:
+    from app.metrics import Metrics, MetricsShard
+    from app.server import HttpServer
+    from demo.handlers import EchoHandler
+
+    class DiscardingShard(MetricsShard):
+        __slots__ = ()
+
+        def observe_request(
+            self, route: str, method: str, status: int, duration: float
+        ) -> None:
+            pass
+
+    class DiscardingMetrics(Metrics):
+        def shard(self) -> MetricsShard:
+            return DiscardingShard(self.buckets)
+
+    metrics = Metrics() if mode == "enabled" else DiscardingMetrics()
+    server = HttpServer(host, port, metrics=metrics)
+    server.router.add_route("/echo/{message}", EchoHandler)
+    server.run(workers=1)
+
+
+def start_server(mode: str, host: str, port: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "bench.metrics_overhead",
+            "--serve",
+            mode,
+            "--port",
+            str(port),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"server with metrics {mode} did not start on port {port}")
+
+
+def measure(mode: str, args: argparse.Namespace, port: int) -> float:
+    process = start_server(mode, args.host, port)
+    request = build_request(path="/echo/hello")
+    try:
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            results = list(
+                pool.map(
+                    lambda _: request_loop(args.host, port, request, args.duration),
+                    range(args.clients),
+                )
+            )
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return sum(result[0] for result in results) / args.duration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4350)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--serve", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.host, args.port)
+        return
+
+    rps = {
+        mode: measure(mode, args, args.port + offset)
+        for offset, mode in enumerate(MODES)
+    }
+    for mode in MODES:
+        print(f"metrics {mode:<10}{rps[mode]:>12.0f} rps")
+    overhead = 1 - rps["enabled"] / rps["disabled"]
+    print(f"overhead          {overhead:>12.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Microbenchmarks for the request hot path.
+
+Times ``Request.deserialize``, ``Response.serialize``, header parsing with
+``Headers.from_raw``, ``Router.match_route``, the incremental ``RequestParser``
+and handler dispatch on representative inputs and reports nanoseconds per call.
+
+    python -m bench.micro --number 20000
+"""
+
+import argparse
+import json
+import timeit
+from typing import Callable
+
+from app.handler import BaseHandler
+from app.http.headers import Headers
+from app.http.parser import RequestParser
+from app.http.request import Request
+from app.http.response import Response
+from app.http.status import Status
+from app.router import Router
+
+REQUEST_HEAD = (
+    "GET /todos/42 HTTP/1.1\r\n"
+    "Host: localhost:4221\r\n"
+    "User-Agent: bench/1.0\r\n"
+    "Accept: application/json\r\n"
+    "Accept-Encoding: gzip, deflate\r\n"
+    "Connection: keep-alive\r\n"
+)
+REQUEST = REQUEST_HEAD + "\r\n"
+POST_BODY = json.dumps({"title": "Write benchmarks", "completed": False})
+POST_REQUEST = (
+    REQUEST_HEAD.replace("GET", "POST", 1)
+    + f"Content-Type: application/json\r\nContent-Length: {len(POST_BODY)}\r\n\r\n"
+    + POST_BODY
+)
+# The header block as the parser hands it to Headers: each line preceded by CRLF.
+RAW_HEADERS = REQUEST_HEAD[REQUEST_HEAD.index("\r\n") :].rstrip("\r\n").encode()
+RESPONSE_BODY = json.dumps([{"id": i, "title": f"todo {i}"} for i in range(20)])
+
+
+def build_router() -> Router:
+    router = Router()
+    for index in range(50):
+        base = f"/api/v1/resource{index}"
+        router.add_route(base, BaseHandler)
+        router.add_route(base + "/{id}", BaseHandler)
+    return router
+
+
+def parse_pipelined(data: bytes, count: int) -> None:
+    parser = RequestParser()
+    parser.feed(data)
+    for _ in range(count):
+        parser.next_request()
+
+
+class EchoHandler(BaseHandler):
+    def get(self, request: Request) -> Response:
+        return Response(body="ok")
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    router = build_router()
+    pipelined = REQUEST.encode() * 16
+    handler = EchoHandler()
+    get_request = Request.deserialize(REQUEST)
+    head_request = Request.deserialize(REQUEST.replace("GET", "HEAD", 1))
+    options_request = Request.deserialize(REQUEST.replace("GET", "OPTIONS", 1))
+    return {
+        "request_deserialize_get": lambda: Request.deserialize(REQUEST),
+        "request_deserialize_post": lambda: Request.deserialize(POST_REQUEST),
+        # One framing lookup, as the parser does, and a full parse of every line.
+        "headers_lookup": lambda: Headers.from_raw(RAW_HEADERS).get("Connection"),
+        "headers_parse_all": lambda: dict(Headers.from_raw(RAW_HEADERS).items()),
+        "response_serialize": lambda: Response(
+            status=Status.OK,
+            headers={"Content-Type": "application/json"},
+            body=RESPONSE_BODY,
+        ).serialize(),
+        "match_route_static": lambda: router.match_route("/api/v1/resource49"),
+        "match_route_param": lambda: router.match_route("/api/v1/resource49/7"),
+        "match_route_miss": lambda: router.match_route("/api/v2/unknown"),
+        "parser_pipelined_x16": lambda: parse_pipelined(pipelined, 16),
+        "handler_dispatch_get": lambda: handler(get_request),
+        "handler_dispatch_head": lambda: handler(head_request),
+        "handler_dispatch_options": lambda: handler(options_request),
+    }
+
+
+def run_micro(number: int, repeat: int = 3) -> dict[str, float]:
+    """
+    Time every case, keeping the best of repeat runs.
+
+    Args:
+        number (int): Calls per run.
+        repeat (int): Runs per case.
+
+    Returns:
+        dict[str, float]: Nanoseconds per call, keyed by case name.
+    """
+    results: dict[str, float] = {}
+    for name, func in cases().items():
+        best = min(timeit.repeat(func, number=number, repeat=repeat))
+        results[name] = best / number * 1e9
+    return results
+
+
+def format_micro(results: dict[str, float]) -> str:
+    lines = [f"{'case':<28}{'ns/op':>12}"]
+    lines.extend(f"{name:<28}{ns:>12.0f}" for name, ns in results.items())
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(format_micro(run_micro(args.number, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Route lookup microbenchmark.
+
+Registers a few hundred static and parameterised routes and times
+``Router.match_route`` for static hits, parameter hits and misses, next to the
+linear pattern scan the trie router replaced.
+
+    python -m bench.router --resources 100 --number 20000
+"""
+
+import argparse
+import timeit
+from typing import Callable
+
+from app.handler import BaseHandler
+from app.router import Router
+
+
+class LinearRouter:
+    """The pre-trie lookup: exact dict hit, then scan every pattern."""
+
+    def __init__(self) -> None:
+        self.routes: dict[str, Callable] = {}
+
+    def add_route(self, path: str, handler: Callable) -> None:
+        self.routes[path] = handler()
+
+    def match_route(self, path: str) -> tuple[Callable | None, dict]:
+        if path in self.routes:
+            return self.routes[path], {}
+        for pattern, handler in self.routes.items():
+            params = self._match_pattern(pattern, path)
+            if params is not None:
+                return handler, params
+        return None, {}
+
+    def _match_pattern(self, pattern: str, path: str) -> dict | None:
+        pattern_parts = pattern.split("/")
+        path_parts = path.split("/")
+        if len(pattern_parts) != len(path_parts):
+            return None
+        params = {}
+        for p_part, actual_part in zip(pattern_parts, path_parts):
+            if p_part.startswith("{") and p_part.endswith("}"):
+                params[p_part[1:-1]] = actual_part
+            elif p_part != actual_part:
+                return None
+        return params
+
+
+def register(router: Router | LinearRouter, resources: int) -> None:
+    for index in range(resources):
+        base = f"/api/v1/resource{index}"
+        router.add_route(base, BaseHandler)
+        router.add_route(base + "/{id}", BaseHandler)
+        router.add_route(base + "/{id}/children/{child}", BaseHandler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resources", type=int, default=100)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    last = args.resources - 1
+    paths = {
+        "static hit": f"/api/v1/resource{last}",
+        "param hit": f"/api/v1/resource{last}/42/children/7",
+        "miss": "/api/v2/unknown/42",
+    }
+
+    print(f"{args.resources * 3} routes, ns per lookup")
+    print(f"{'case':<12}{'linear':>12}{'trie':>12}")
+    routers: list[Router | LinearRouter] = [LinearRouter(), Router()]
+    for router in routers:
+        register(router, args.resources)
+
+    for case, path in paths.items():
+        timings = []
+        for router in routers:
+            seconds = timeit.timeit(
+                lambda: router.match_route(path), number=args.number
+            )
+            timings.append(seconds / args.number * 1e9)
+        print(f"{case:<12}{timings[0]:>12.0f}{timings[1]:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Concurrent read/write workload for the sharded in-memory store.
+
+Preloads ``--items`` items, then runs ``--threads`` threads that each mix
+reads, creates, updates, deletes and cursor-paginated listings for
+``--duration`` seconds, once per shard count. Reports operations per second
+and the p99 latency of reads and of page listings. Next to it, the same
+workload runs against a dict behind one lock that allocates ids by scanning
+for the highest existing one, as the demo TODO API used to.
+
+    python -m bench.store --threads 8 --duration 3 --shards 1 --shards 16
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import Callable
+
+from app.store import ShardedStore
+
+# Cumulative operation weights out of 100: get, create, update, delete, page.
+MIX = ((70, "get"), (85, "create"), (93, "update"), (95, "delete"), (100, "page"))
+PAGE_SIZE = 50
+
+
+class ScanningStore:
+    """The previous demo storage: one lock and an O(n) max() for every new id."""
+
+    def __init__(self) -> None:
+        self.items: dict[int, dict] = {}
+        self.lock = threading.Lock()
+
+    def create(self, build: Callable[[int], dict]) -> dict:
+        with self.lock:
+            item_id = max(self.items, default=0) + 1
+            item = self.items[item_id] = build(item_id)
+        return item
+
+    def get(self, item_id: int) -> dict | None:
+        return self.items.get(item_id)
+
+    def update(self, item_id: int, item: dict) -> bool:
+        with self.lock:
+            if item_id not in self.items:
+                return False
+            self.items[item_id] = item
+        return True
+
+    def delete(self, item_id: int) -> bool:
+        with self.lock:
+            return self.items.pop(item_id, None) is not None
+
+    def page(self, limit: int, cursor: str | None = None) -> list[dict]:
+        after = int(cursor, 16) if cursor else 0
+        with self.lock:
+            ids = sorted(item_id for item_id in self.items if item_id > after)
+            return [self.items[item_id] for item_id in ids[:limit]]
+
+
+def make_item(item_id: int) -> dict:
+    return {"id": str(item_id), "title": f"todo {item_id}", "completed": False}
+
+
+def worker(
+    store: ShardedStore | ScanningStore,
+    high_id: list[int],
+    duration: float,
+    seed: int,
+) -> tuple[int, list[float], list[float]]:
+    rng = random.Random(seed)
+    operations = 0
+    reads: list[float] = []
+    pages: list[float] = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        roll = rng.randrange(100)
+        operation = next(name for weight, name in MIX if roll < weight)
+        item_id = rng.randrange(1, high_id[0] + 1)
+        started = time.perf_counter()
+        if operation == "get":
+            store.get(item_id)
+            reads.append(time.perf_counter() - started)
+        elif operation == "create":
+            created = store.create(make_item)
+            high_id[0] = max(high_id[0], int(created["id"]))
+        elif operation == "update":
+            store.update(item_id, make_item(item_id))
+        elif operation == "delete":
+            store.delete(item_id)
+        else:
+            store.page(PAGE_SIZE, format(item_id, "x"))
+            pages.append(time.perf_counter() - started)
+        operations += 1
+    return operations, reads, pages
+
+
+def run_workload(
+    store: ShardedStore | ScanningStore, items: int, threads: int, duration: float
+) -> tuple[float, float, float]:
+    """Run the mixed workload and return ops/s and p99 read and page latency."""
+    for _ in range(items):
+        store.create(make_item)
+    high_id = [items]
+    results: list[tuple[int, list[float], list[float]]] = []
+    pool = [
+        threading.Thread(
+            target=lambda seed=seed: results.append(
+                worker(store, high_id, duration, seed)
+            )
+        )
+        for seed in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    operations = sum(result[0] for result in results)
+    reads = sorted(latency for result in results for latency in result[1])
+    pages = sorted(latency for result in results for latency in result[2])
+    return operations / duration, p99(reads) * 1e6, p99(pages) * 1e6
+
+
+def p99(latencies: list[float]) -> float:
+    if not latencies:
+        return 0.0
+    return latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--shards", type=int, action="append")
+    args = parser.parse_args()
+
+    stores: dict[str, Callable[[], ShardedStore | ScanningStore]] = {
+        "single lock + scan": ScanningStore
+    }
+    for shards in args.shards or [1, 16]:
+        stores[f"sharded x{shards}"] = lambda shards=shards: ShardedStore(shards)
+
+    print(f"{args.items} items, {args.threads} threads")
+    print(f"{'store':<20}{'ops/s':>12}{'get p99 us':>12}{'page p99 us':>13}")
+    for name, factory in stores.items():
+        ops, read_p99, page_p99 = run_workload(
+            factory(), args.items, args.threads, args.duration
+        )
+        print(f"{name:<20}{ops:>12.0f}{read_p99:>12.1f}{page_p99:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,30 @@
 import json
 import logging
 from datetime import datetime
+from typing import Iterator
 
 from app.handler import BaseHandler
 from app.http.request import Request
 from app.http.response import Response
 from app.http.status import Status
+from app.store import InvalidCursorError, ShardedStore
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Pages with more items than this are JSON-encoded as a stream, not one string.
+STREAM_THRESHOLD = 200
 
-TODOS: dict[str, dict] = {
-    "1": {"id": "1", "title": "Learn HTTP", "completed": True},
-    "2": {"id": "2", "title": "Build a server", "completed": True},
-    "3": {"id": "3", "title": "Test the server", "completed": False},
-}
+TODOS: ShardedStore[dict] = ShardedStore()
+for _title, _completed in (
+    ("Learn HTTP", True),
+    ("Build a server", True),
+    ("Test the server", False),
+):
+    TODOS.create(
+        lambda todo_id: {"id": str(todo_id), "title": _title, "completed": _completed}
+    )
 
 
 class HomeHandler(BaseHandler):
@@ -56,8 +66,8 @@ class HomeHandler(BaseHandler):
             </div>
 
             <div class="endpoint">
-                <h3>GET /todos</h3>
-                <p>List all TODOs</p>
+                <h3>GET /todos?limit=100&amp;cursor=...</h3>
+                <p>List TODOs a page at a time; the Link header points to the next page</p>
             </div>
 
             <div class="endpoint">
@@ -115,67 +125,95 @@ class EchoHandler(BaseHandler):
 
 class TodosHandler(BaseHandler):
     def get(self, request: Request) -> Response:
-        return Response(
-            body=json.dumps(list(TODOS.values()), indent=2),
-            headers={"Content-Type": "application/json"},
-        )
+        try:
+            limit = int(request.query.get("limit", DEFAULT_PAGE_SIZE))
+            if not 1 <= limit <= MAX_PAGE_SIZE:
+                raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+            page = TODOS.page(limit, request.query.get("cursor"))
+        except (InvalidCursorError, ValueError) as e:
+            return Response(status=Status.BAD_REQUEST, body=str(e))
+
+        headers = {"Content-Type": "application/json"}
+        if page.next_cursor is not None:
+            headers["Link"] = (
+                f'</todos?limit={limit}&cursor={page.next_cursor}>; rel="next"'
+            )
+        todos = [todo for _, todo in page.items]
+        if len(todos) > STREAM_THRESHOLD:
+            return Response(body=_stream_json_array(todos), headers=headers)
+        return Response(body=json.dumps(todos), headers=headers)
 
     def post(self, request: Request) -> Response:
         try:
             todo = json.loads(request.body)
-            todo_id = str(max(int(id) for id in TODOS.keys()) + 1)
-            todo["id"] = todo_id
-            TODOS[todo_id] = todo
-
-            return Response(
-                status=Status.CREATED,
-                body=json.dumps(todo, indent=2),
-                headers={"Content-Type": "application/json"},
-            )
+            if not isinstance(todo, dict):
+                raise ValueError("expected a JSON object")
         except (json.JSONDecodeError, ValueError) as e:
             return Response(status=Status.BAD_REQUEST, body=f"Invalid JSON: {str(e)}")
 
+        created = TODOS.create(lambda todo_id: {**todo, "id": str(todo_id)})
+        return Response(
+            status=Status.CREATED,
+            body=json.dumps(created),
+            headers={"Content-Type": "application/json"},
+        )
+
 
 class TodoHandler(BaseHandler):
     def get(self, request: Request) -> Response:
-        todo_id = request.metadata.path_params.get("id", "")
-        todo = TODOS.get(todo_id)
-
-        if not todo:
-            return Response(
-                status=Status.NOT_FOUND, body=f"Todo with ID {todo_id} not found"
-            )
+        todo_id = _todo_id(request)
+        todo = TODOS.get(todo_id) if todo_id is not None else None
+        if todo is None:
+            return _todo_not_found(request)
 
         return Response(
-            body=json.dumps(todo, indent=2),
+            body=json.dumps(todo),
             headers={"Content-Type": "application/json"},
         )
 
     def put(self, request: Request) -> Response:
-        todo_id = request.metadata.path_params.get("id", "")
-        if todo_id not in TODOS:
-            return Response(
-                status=Status.NOT_FOUND, body=f"Todo with ID {todo_id} not found"
-            )
+        todo_id = _todo_id(request)
+        if todo_id is None or todo_id not in TODOS:
+            return _todo_not_found(request)
 
         try:
             updated_todo = json.loads(request.body)
-            updated_todo["id"] = todo_id
-            TODOS[todo_id] = updated_todo
-
-            return Response(
-                body=json.dumps(updated_todo, indent=2),
-                headers={"Content-Type": "application/json"},
-            )
-        except json.JSONDecodeError:
+            if not isinstance(updated_todo, dict):
+                raise ValueError("expected a JSON object")
+        except (json.JSONDecodeError, ValueError):
             return Response(status=Status.BAD_REQUEST, body="Invalid JSON")
 
-    def delete(self, request: Request) -> Response:
-        todo_id = request.metadata.path_params.get("id", "")
-        if todo_id not in TODOS:
-            return Response(
-                status=Status.NOT_FOUND, body=f"Todo with ID {todo_id} not found"
-            )
+        updated_todo["id"] = str(todo_id)
+        if not TODOS.update(todo_id, updated_todo):
+            return _todo_not_found(request)
+        return Response(
+            body=json.dumps(updated_todo),
+            headers={"Content-Type": "application/json"},
+        )
 
-        del TODOS[todo_id]
+    def delete(self, request: Request) -> Response:
+        todo_id = _todo_id(request)
+        if todo_id is None or not TODOS.delete(todo_id):
+            return _todo_not_found(request)
         return Response(status=Status.NO_CONTENT)
+
+
+def _todo_id(request: Request) -> int | None:
+    try:
+        return int(request.metadata.path_params.get("id", ""))
+    except ValueError:
+        return None
+
+
+def _todo_not_found(request: Request) -> Response:
+    todo_id = request.metadata.path_params.get("id", "")
+    return Response(status=Status.NOT_FOUND, body=f"Todo with ID {todo_id} not found")
+
+
+def _stream_json_array(items: list[dict], batch_size: int = 100) -> Iterator[str]:
+    """Encode items as a JSON array a batch at a time."""
+    yield "["
+    for start in range(0, len(items), batch_size):
+        batch = ",".join(json.dumps(item) for item in items[start : start + batch_size])
+        yield batch if start == 0 else "," + batch
+    yield "]"
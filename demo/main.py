@@ -1,3 +1,5 @@
+import argparse
+
 from demo.handlers import (
     EchoHandler,
     HomeHandler,
@@ -6,20 +8,114 @@ from demo.handlers import (
     TodoHandler,
     TodosHandler,
 )
+from app.access_log import AccessLog, AccessLogFormat
+from app.configs import settings
+from app.monitoring import MetricsHandler
+from app.ratelimit import RateLimit, RateLimiter
 from app.server import HttpServer
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the HTTP server demo.")
+    parser.add_argument("--host", default="localhost", help="address to bind")
+    parser.add_argument("--port", type=int, default=4221, help="port to bind")
+    parser.add_argument(
+        "--unix-socket",
+        metavar="PATH",
+        default=settings.unix_socket,
+        help="listen on a Unix domain socket at PATH instead of TCP",
+    )
+    parser.add_argument(
+        "--unix-socket-mode",
+        type=lambda value: int(value, 8),
+        default=settings.unix_socket_mode,
+        help="octal permissions of the Unix domain socket (default: 660)",
+    )
+    parser.add_argument(
+        "--fd",
+        type=int,
+        default=settings.listen_fd,
+        help="serve an inherited listening socket instead of binding one",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.workers,
+        help="number of worker processes to fork (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--access-log",
+        metavar="PATH",
+        help="write an access log to PATH, or to standard output with '-'",
+    )
+    parser.add_argument(
+        "--access-log-format",
+        choices=[log_format.value for log_format in AccessLogFormat],
+        default=AccessLogFormat.COMBINED.value,
+    )
+    parser.add_argument(
+        "--access-log-sample",
+        type=float,
+        default=1.0,
+        help="fraction of requests written to the access log",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        metavar="RATE",
+        help="limit each client to RATE requests per second",
+    )
+    parser.add_argument(
+        "--rate-limit-burst",
+        type=int,
+        help="requests a client may make back to back (default: twice RATE)",
+    )
+    parser.add_argument(
+        "--trusted-proxy",
+        action="append",
+        default=[],
+        metavar="NETWORK",
+        help="identify clients behind the proxy at NETWORK by X-Forwarded-For "
+        "(repeatable)",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
-    server = HttpServer(host="localhost", port=4221)
+    args = parse_args()
+    access_log = None
+    if args.access_log:
+        access_log = AccessLog(
+            None if args.access_log == "-" else args.access_log,
+            log_format=AccessLogFormat(args.access_log_format),
+            sample_rate=args.access_log_sample,
+        )
+    rate_limiter = None
+    if args.rate_limit:
+        burst = args.rate_limit_burst or max(1, int(args.rate_limit * 2))
+        rate_limiter = RateLimiter(
+            RateLimit(rate=args.rate_limit, burst=burst),
+            trusted_proxies=args.trusted_proxy,
+        )
+    server = HttpServer(
+        host=args.host,
+        port=args.port,
+        unix_socket=args.unix_socket,
+        unix_socket_mode=args.unix_socket_mode,
+        listen_fd=args.fd,
+        access_log=access_log,
+        rate_limiter=rate_limiter,
+    )
 
-    server.router.add_route("/", HomeHandler)
+    server.router.add_route("/", HomeHandler, cache=True)
     server.router.add_route("/info", InfoHandler)
     server.router.add_route("/time", TimeHandler)
     server.router.add_route("/echo/{message}", EchoHandler)
-    server.router.add_route("/todos", TodosHandler)
+    server.router.add_route("/todos", TodosHandler, cache=True)
     server.router.add_route("/todos/{id}", TodoHandler)
+    server.router.add_route("/metrics", MetricsHandler)
 
-    server.run()
+    server.run(workers=args.workers)
 
 
 if __name__ == "__main__":